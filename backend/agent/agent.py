@@ -1,23 +1,67 @@
+import json
+import logging
+from typing import Optional
 import openai
 from config import get_llm_config
 from .prompt import AGENT_PROMPT
-import json
-class Agent:  
+
+logger = logging.getLogger(__name__)
+
+# Built once at import; every request reuses the same system message
+SYSTEM_MESSAGE = {"role": "system", "content": AGENT_PROMPT}
+
+
+class Agent:
+    """
+    Async query parser backed by the OpenAI chat API.
+
+    One instance (and one connection pool) is shared by the whole
+    process; generate_response keeps no per-call state so concurrent
+    requests can use it safely.
+    """
+
     def __init__(self):
-        self.api_key = get_llm_config()["openai_api_key"]
-        self.client = openai.OpenAI(api_key=self.api_key)
-        self.messages = [{"role": "system", "content": AGENT_PROMPT}]
-
-    def generate_response(self, message: str):
-        self.messages.append({"role": "user", "content": message})
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=self.messages
+        config = get_llm_config()
+        self.model = config["model"]
+        self.client = openai.AsyncOpenAI(
+            api_key=config["openai_api_key"],
+            timeout=config["timeout"],
+            max_retries=config["max_retries"],
+        )
+
+    async def generate_response(self, message: str) -> Optional[dict]:
+        messages = [SYSTEM_MESSAGE, {"role": "user", "content": message}]
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages
         )
 
         response = json.loads(response.choices[0].message.content)
-        
+
         if 'fields' in response:
             return response
         else:
-            return None
\ No newline at end of file
+            return None
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+_agent: Optional[Agent] = None
+
+
+def get_agent() -> Agent:
+    """Get the process-wide Agent, creating it on first use."""
+    global _agent
+    if _agent is None:
+        _agent = Agent()
+    return _agent
+
+
+async def close_agent() -> None:
+    """Close the process-wide Agent's HTTP client if it was created."""
+    global _agent
+    if _agent is not None:
+        await _agent.close()
+        _agent = None
+        logger.info("Agent: Closed OpenAI client")
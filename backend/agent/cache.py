@@ -0,0 +1,53 @@
+import copy
+import re
+import unicodedata
+from typing import Optional
+from config import get_query_cache_config
+from utils.cache import TTLCache
+
+# Turkish dotted/dotless I do not round-trip through str.lower()
+_TURKISH_CASE_MAP = str.maketrans({"I": "ı", "İ": "i"})
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query into a cache key.
+
+    Applies NFC normalization, Turkish-aware case folding
+    ("İ" -> "i", "I" -> "ı") and collapses whitespace.
+    """
+    query = unicodedata.normalize("NFC", query)
+    query = query.translate(_TURKISH_CASE_MAP).casefold()
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class QueryFieldsCache:
+    """Cache of parsed `fields` dicts keyed by normalized query text."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+
+    def get(self, query: str) -> Optional[dict]:
+        fields = self._cache.get(normalize_query(query))
+        # Callers get their own copy so they cannot mutate the cached entry
+        return copy.deepcopy(fields) if fields is not None else None
+
+    def set(self, query: str, fields: dict) -> None:
+        self._cache.set(normalize_query(query), copy.deepcopy(fields))
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+def _create_query_fields_cache() -> QueryFieldsCache:
+    config = get_query_cache_config()
+    return QueryFieldsCache(max_size=config["max_size"], ttl=config["ttl"])
+
+
+query_fields_cache = _create_query_fields_cache()
+
+
+def get_query_fields_cache() -> QueryFieldsCache:
+    """Get the application-wide query fields cache."""
+    return query_fields_cache
@@ -0,0 +1,427 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from config import get_fast_parser_config
+from .cache import normalize_query
+
+# Phrase -> (field, value). Phrases are written in normalized form
+# (see normalize_query) and matched on whole tokens, longest first.
+_BOOLEAN_KEYWORDS: Dict[str, Tuple[str, object]] = {
+    # English
+    "open now": ("currentOpeningHours", {"openNow": True}),
+    "currently open": ("currentOpeningHours", {"openNow": True}),
+    "open right now": ("currentOpeningHours", {"openNow": True}),
+    "open": ("currentOpeningHours", {"openNow": True}),
+    "dog friendly": ("allowsDogs", True),
+    "dogs allowed": ("allowsDogs", True),
+    "pet friendly": ("allowsDogs", True),
+    "outdoor seating": ("outdoorSeating", True),
+    "outdoor": ("outdoorSeating", True),
+    "outdoors": ("outdoorSeating", True),
+    "terrace": ("outdoorSeating", True),
+    "garden": ("outdoorSeating", True),
+    "live music": ("liveMusic", True),
+    "kids menu": ("menuForChildren", True),
+    "children's menu": ("menuForChildren", True),
+    "childrens menu": ("menuForChildren", True),
+    "cocktail": ("servesCocktails", True),
+    "cocktails": ("servesCocktails", True),
+    "dessert": ("servesDessert", True),
+    "desserts": ("servesDessert", True),
+    "coffee": ("servesCoffee", True),
+    "kid friendly": ("goodForChildren", True),
+    "family friendly": ("goodForChildren", True),
+    "good for kids": ("goodForChildren", True),
+    "good for children": ("goodForChildren", True),
+    "restroom": ("restroom", True),
+    "toilet": ("restroom", True),
+    "good for groups": ("goodForGroups", True),
+    "groups": ("goodForGroups", True),
+    "watch sports": ("goodForWatchingSports", True),
+    "watch the game": ("goodForWatchingSports", True),
+    "watch the match": ("goodForWatchingSports", True),
+    "delivery": ("delivery", True),
+    "dine in": ("dineIn", True),
+    "dine-in": ("dineIn", True),
+    "reservation": ("reservable", True),
+    "reservations": ("reservable", True),
+    "reservable": ("reservable", True),
+    "breakfast": ("servesBreakfast", True),
+    "lunch": ("servesLunch", True),
+    "dinner": ("servesDinner", True),
+    "beer": ("servesBeer", True),
+    "wine": ("servesWine", True),
+    "brunch": ("servesBrunch", True),
+    "vegetarian": ("servesVegetarianFood", True),
+    "vegan": ("servesVegetarianFood", True),
+    "operational": ("businessStatus", "OPERATIONAL"),
+    "cheap": ("priceLevel", "PRICE_LEVEL_INEXPENSIVE"),
+    "inexpensive": ("priceLevel", "PRICE_LEVEL_INEXPENSIVE"),
+    "affordable": ("priceLevel", "PRICE_LEVEL_INEXPENSIVE"),
+    "budget": ("priceLevel", "PRICE_LEVEL_INEXPENSIVE"),
+    "moderate": ("priceLevel", "PRICE_LEVEL_MODERATE"),
+    "mid-range": ("priceLevel", "PRICE_LEVEL_MODERATE"),
+    "expensive": ("priceLevel", "PRICE_LEVEL_EXPENSIVE"),
+    "upscale": ("priceLevel", "PRICE_LEVEL_EXPENSIVE"),
+    "fancy": ("priceLevel", "PRICE_LEVEL_EXPENSIVE"),
+    "very expensive": ("priceLevel", "PRICE_LEVEL_VERY_EXPENSIVE"),
+    "free entry": ("priceLevel", "PRICE_LEVEL_FREE"),
+    "free admission": ("priceLevel", "PRICE_LEVEL_FREE"),
+    # Turkish
+    "şu an açık": ("currentOpeningHours", {"openNow": True}),
+    "şimdi açık": ("currentOpeningHours", {"openNow": True}),
+    "açık olan": ("currentOpeningHours", {"openNow": True}),
+    "açık": ("currentOpeningHours", {"openNow": True}),
+    "köpek dostu": ("allowsDogs", True),
+    "evcil hayvan dostu": ("allowsDogs", True),
+    "açık hava": ("outdoorSeating", True),
+    "bahçe": ("outdoorSeating", True),
+    "teras": ("outdoorSeating", True),
+    "canlı müzik": ("liveMusic", True),
+    "çocuk menüsü": ("menuForChildren", True),
+    "kokteyl": ("servesCocktails", True),
+    "tatlı": ("servesDessert", True),
+    "kahve": ("servesCoffee", True),
+    "çocuk dostu": ("goodForChildren", True),
+    "aile dostu": ("goodForChildren", True),
+    "tuvalet": ("restroom", True),
+    "grup": ("goodForGroups", True),
+    "kalabalık": ("goodForGroups", True),
+    "maç izle": ("goodForWatchingSports", True),
+    "maç izlemek": ("goodForWatchingSports", True),
+    "maç yayını": ("goodForWatchingSports", True),
+    "paket servis": ("delivery", True),
+    "eve servis": ("delivery", True),
+    "teslimat": ("delivery", True),
+    "rezervasyon": ("reservable", True),
+    "kahvaltı": ("servesBreakfast", True),
+    "öğle yemeği": ("servesLunch", True),
+    "akşam yemeği": ("servesDinner", True),
+    "bira": ("servesBeer", True),
+    "şarap": ("servesWine", True),
+    "vejetaryen": ("servesVegetarianFood", True),
+    "vejeteryan": ("servesVegetarianFood", True),
+    "ucuz": ("priceLevel", "PRICE_LEVEL_INEXPENSIVE"),
+    "uygun fiyatlı": ("priceLevel", "PRICE_LEVEL_INEXPENSIVE"),
+    "hesaplı": ("priceLevel", "PRICE_LEVEL_INEXPENSIVE"),
+    "orta fiyatlı": ("priceLevel", "PRICE_LEVEL_MODERATE"),
+    "pahalı": ("priceLevel", "PRICE_LEVEL_EXPENSIVE"),
+    "lüks": ("priceLevel", "PRICE_LEVEL_EXPENSIVE"),
+    "çok pahalı": ("priceLevel", "PRICE_LEVEL_VERY_EXPENSIVE"),
+    "ücretsiz giriş": ("priceLevel", "PRICE_LEVEL_FREE"),
+    "giriş ücretsiz": ("priceLevel", "PRICE_LEVEL_FREE"),
+}
+
+# Single words that usually map to the field but often mean something else
+# ("open late", "garden view", "a good coffee", "for groups of 2"). They only
+# count as half explained, so a query built on them alone stays below the
+# confidence threshold and goes to the LLM.
+_AMBIGUOUS_KEYWORDS = frozenset("""
+open terrace garden coffee groups açık bahçe teras kahve grup kalabalık
+""".split())
+
+_AMBIGUOUS_WEIGHT = 0.5
+
+# Phrase -> (nested field, option key); the value is always True
+_OPTION_KEYWORDS: Dict[str, Tuple[str, str]] = {
+    "credit card": ("paymentOptions", "acceptsCreditCards"),
+    "credit cards": ("paymentOptions", "acceptsCreditCards"),
+    "kredi kartı": ("paymentOptions", "acceptsCreditCards"),
+    "debit card": ("paymentOptions", "acceptsDebitCards"),
+    "debit cards": ("paymentOptions", "acceptsDebitCards"),
+    "banka kartı": ("paymentOptions", "acceptsDebitCards"),
+    "cash only": ("paymentOptions", "acceptsCashOnly"),
+    "sadece nakit": ("paymentOptions", "acceptsCashOnly"),
+    "nfc": ("paymentOptions", "acceptsNfc"),
+    "contactless": ("paymentOptions", "acceptsNfc"),
+    "temassız": ("paymentOptions", "acceptsNfc"),
+    "wheelchair accessible": ("accessibilityOptions", "wheelchairAccessibleEntrance"),
+    "wheelchair accessible entrance": ("accessibilityOptions", "wheelchairAccessibleEntrance"),
+    "wheelchair accessible seating": ("accessibilityOptions", "wheelchairAccessibleSeating"),
+    "wheelchair accessible parking": ("accessibilityOptions", "wheelchairAccessibleParking"),
+    "wheelchair accessible restroom": ("accessibilityOptions", "wheelchairAccessibleRestroom"),
+    "engelli erişimi": ("accessibilityOptions", "wheelchairAccessibleEntrance"),
+    "engelli dostu": ("accessibilityOptions", "wheelchairAccessibleEntrance"),
+    "tekerlekli sandalye": ("accessibilityOptions", "wheelchairAccessibleEntrance"),
+}
+
+# Words that carry no filter: fillers, place nouns, and amenities
+# the `fields` schema has no field for (the LLM drops those too)
+_STOPWORDS = frozenset("""
+a an the with and or in at near for to of that which has have is are serve serves serving offer offers
+good best nice great top place places spot spots me find show i ı want looking look some any around nearby
+accept accepts accepting take takes
+by on where please also cafe cafes café cafés coffee-shop coffeeshop restaurant restaurants bar bars pub
+pubs bistro eatery somewhere wifi wi-fi internet laptop quiet cozy cosy
+bir ve ile veya ya için olan yer yerler yeri mekan mekanlar mekanı kafe kafeler cafeler restoran
+restoranlar lokanta barlar en iyi güzel bana öner önerir bul bulur istiyorum arıyorum var mı mi mu mü
+yakın yakını yakınında civarı civarında de da sunan veren servis bulunan hem olsun olur lütfen kabul eden
+kahveci kahveciler wifi internet priz sessiz sakin yapılacak gidilecek oturulacak
+""".split())
+
+# Common locations; they are part of the text query, not of `fields`
+_LOCATIONS = frozenset("""
+istanbul ankara izmir kadıköy beşiktaş beyoğlu şişli üsküdar bakırköy sarıyer moda cihangir karaköy
+nişantaşı bebek ortaköy taksim galata etiler levent maslak ataşehir kartal maltepe fatih sultanahmet
+balat kurtuluş arnavutköy kuzguncuk çengelköy bostancı caddebostan suadiye göztepe fenerbahçe
+""".split())
+
+_NEGATIONS = frozenset("""
+not no without don't dont doesn't doesnt isn't isnt non except değil olmayan olmasın yok hariç
+""".split())
+
+_NEGATIVE_SUFFIXES = ("sız", "siz", "suz", "süz")
+
+_NUM = r"(\d+(?:[.,]\d+)?)"
+_CUR = r"(?:tl|try|₺|lira)"
+_RATING_WORD = r"(?:rating|ratings|rated|stars?|puan\w*|yıldız\w*)"
+
+# (pattern, bound kinds for each captured number)
+_RATING_PATTERNS: List[Tuple[re.Pattern, Tuple[str, ...]]] = [
+    (re.compile(rf"{_RATING_WORD}\s*(?:between\s+)?{_NUM}\s*(?:-|and|to|ile|ve)\s*{_NUM}(?:\s*arası\w*)?"), ("min", "max")),
+    (re.compile(rf"{_NUM}\s*\+\s*{_RATING_WORD}?"), ("min",)),
+    (re.compile(rf"{_RATING_WORD}\s*(?:above|over|of at least|at least|>=|>|min(?:imum)?)\s*{_NUM}"), ("min",)),
+    (re.compile(rf"(?:at least|minimum|min)\s*{_NUM}\s*{_RATING_WORD}"), ("min",)),
+    (re.compile(rf"{_RATING_WORD}\s*{_NUM}\s*(?:ve\s+)?(?:üzeri|üstü)\w*"), ("min",)),
+    (re.compile(rf"{_NUM}\s*{_RATING_WORD}?\s*(?:ve\s+)?(?:üzeri|üstü)\w*(?:\s*{_RATING_WORD})?"), ("min",)),
+    (re.compile(rf"{_RATING_WORD}\s*(?:below|under|less than|<=|<|max(?:imum)?)\s*{_NUM}"), ("max",)),
+    (re.compile(rf"{_RATING_WORD}\s*{_NUM}\s*(?:altı|altında)"), ("max",)),
+    (re.compile(rf"{_NUM}\s*{_RATING_WORD}\s*(?:altı|altında)"), ("max",)),
+]
+
+_PRICE_PATTERNS: List[Tuple[re.Pattern, Tuple[str, ...]]] = [
+    (re.compile(rf"(?:between\s+)?{_NUM}\s*{_CUR}?\s*(?:-|and|to|ile|ve)\s*{_NUM}\s*{_CUR}(?:\s*arası\w*)?"), ("startPrice", "endPrice")),
+    (re.compile(rf"(?:under|below|less than|cheaper than|up to|max(?:imum)?)\s*{_NUM}\s*{_CUR}"), ("endPrice",)),
+    (re.compile(rf"{_NUM}\s*{_CUR}(?:'?[dt][ae]n)?\s*(?:altı|altında|ucuz|az)\w*"), ("endPrice",)),
+    (re.compile(rf"(?:above|over|more than|at least|min(?:imum)?)\s*{_NUM}\s*{_CUR}"), ("startPrice",)),
+    (re.compile(rf"{_NUM}\s*{_CUR}(?:'?[dt][ae]n)?\s*(?:üstü|üzeri|fazla|pahalı)\w*"), ("startPrice",)),
+]
+
+_TOKEN = re.compile(r"[\w'+-]+")
+_RATING_TOKEN = re.compile(rf"{_RATING_WORD}")
+
+_PHRASES = sorted(
+    [(tuple(phrase.split()), phrase) for phrase in list(_BOOLEAN_KEYWORDS) + list(_OPTION_KEYWORDS)],
+    key=lambda item: len(item[0]),
+    reverse=True,
+)
+
+
+class FastParseResult(NamedTuple):
+    response: dict
+    confidence: float
+
+
+class _Conflict(Exception):
+    pass
+
+
+def _to_number(raw: str) -> float:
+    return float(raw.replace(",", "."))
+
+
+def _to_units(raw: str) -> str:
+    value = _to_number(raw)
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+def _strip_suffix(token: str) -> str:
+    """Drop a Turkish apostrophe suffix: "kadıköy'de" -> "kadıköy"."""
+    return token.split("'", 1)[0] if "'" in token else token
+
+
+def _merge(fields: dict, key: str, value) -> None:
+    existing = fields.get(key)
+    if existing is None:
+        fields[key] = value
+    elif isinstance(existing, dict) and isinstance(value, dict):
+        for sub_key, sub_value in value.items():
+            if sub_key in existing and existing[sub_key] != sub_value:
+                raise _Conflict(key)
+            existing[sub_key] = sub_value
+    elif existing != value:
+        raise _Conflict(key)
+
+
+def _extract(text: str, patterns, build) -> Tuple[str, List[tuple]]:
+    """Apply patterns to text, blanking out every match. Returns (rest, matches)."""
+    matches = []
+    for pattern, kinds in patterns:
+        def replace(match):
+            matches.append(build(kinds, match.groups()))
+            return " "
+        text = pattern.sub(replace, text)
+    return text, matches
+
+
+def _match_keyword(tokens: List[str], start: int) -> Optional[Tuple[str, int]]:
+    for phrase_tokens, phrase in _PHRASES:
+        end = start + len(phrase_tokens)
+        if tuple(tokens[start:end]) == phrase_tokens:
+            return phrase, end
+    return None
+
+
+def _match_keyword_prefix(token: str) -> Optional[str]:
+    """Single-word Turkish keywords also match suffixed forms: "kahvaltılı" -> "kahvaltı"."""
+    for phrase_tokens, phrase in _PHRASES:
+        if len(phrase_tokens) == 1 and len(phrase) >= 4 and token.startswith(phrase) and token != phrase:
+            return phrase
+    return None
+
+
+def _apply_keyword(fields: dict, phrase: str) -> None:
+    if phrase in _BOOLEAN_KEYWORDS:
+        key, value = _BOOLEAN_KEYWORDS[phrase]
+        _merge(fields, key, dict(value) if isinstance(value, dict) else value)
+    else:
+        key, option = _OPTION_KEYWORDS[phrase]
+        _merge(fields, key, {option: True})
+
+
+def _keyword_weight(phrase: str) -> float:
+    return _AMBIGUOUS_WEIGHT if phrase in _AMBIGUOUS_KEYWORDS else 1.0
+
+
+def analyze_query(query: str) -> FastParseResult:
+    """
+    Parse a query into the same {"fields": {...}} shape the LLM agent returns.
+
+    Confidence is the share of meaningful tokens the parser could explain
+    (matched keywords, rating/price expressions, known locations); ambiguous
+    keywords count as half explained. Negations
+    and conflicting criteria give 0 so the caller falls back to the LLM.
+    """
+    text = normalize_query(query)
+    fields: dict = {}
+
+    def rating_bounds(kinds, groups):
+        return {kind: _to_number(raw) for kind, raw in zip(kinds, groups)}
+
+    def price_bounds(kinds, groups):
+        return {kind: {"currencyCode": "TRY", "units": _to_units(raw)} for kind, raw in zip(kinds, groups)}
+
+    text, ratings = _extract(text, _RATING_PATTERNS, rating_bounds)
+    text, prices = _extract(text, _PRICE_PATTERNS, price_bounds)
+
+    try:
+        for bounds in ratings:
+            if any(not 0 <= value <= 5 for value in bounds.values()):
+                return FastParseResult({"fields": {}}, 0.0)
+            _merge(fields, "rating", bounds)
+        for bounds in prices:
+            _merge(fields, "priceRange", bounds)
+
+        tokens = [_strip_suffix(token) for token in _TOKEN.findall(text)]
+        explained = len(ratings) + len(prices)
+        content = explained
+
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            if token in _NEGATIONS:
+                return FastParseResult({"fields": fields}, 0.0)
+
+            matched = _match_keyword(tokens, index)
+            if matched is not None:
+                phrase, index = matched
+                _apply_keyword(fields, phrase)
+                explained += _keyword_weight(phrase)
+                content += 1
+                continue
+
+            index += 1
+            if token in _STOPWORDS:
+                continue
+
+            content += 1
+            prefixed = _match_keyword_prefix(token)
+            if prefixed is not None:
+                if token[len(prefixed):].startswith(_NEGATIVE_SUFFIXES):
+                    # "kahvesiz", "alkolsüz": a negated amenity
+                    return FastParseResult({"fields": fields}, 0.0)
+                _apply_keyword(fields, prefixed)
+                explained += _keyword_weight(prefixed)
+            elif token in _LOCATIONS:
+                explained += 1
+    except _Conflict:
+        return FastParseResult({"fields": fields}, 0.0)
+
+    confidence = explained / content if content else 1.0
+    return FastParseResult({"fields": fields}, confidence)
+
+
+def extract_terms(query: str) -> List[str]:
+    """
+    Get the words of a query that name a place or an area rather than a
+    criterion: what is left once rating/price expressions, filter
+    keywords and stopwords are removed (e.g. "moda", a cafe's name).
+    """
+    text = normalize_query(query)
+    text, _ = _extract(text, _RATING_PATTERNS, lambda kinds, groups: None)
+    text, _ = _extract(text, _PRICE_PATTERNS, lambda kinds, groups: None)
+    tokens = [_strip_suffix(token) for token in _TOKEN.findall(text)]
+
+    terms = []
+    index = 0
+    while index < len(tokens):
+        matched = _match_keyword(tokens, index)
+        if matched is not None:
+            index = matched[1]
+            continue
+
+        token = tokens[index]
+        index += 1
+        if token in _STOPWORDS or token in _NEGATIONS or token.isdigit() or _RATING_TOKEN.fullmatch(token):
+            continue
+        if _match_keyword_prefix(token) is not None:
+            continue
+        terms.append(token)
+    return terms
+
+
+class FastQueryParser:
+    """
+    Deterministic local parser in front of the LLM agent.
+
+    parse() returns a response only when its confidence reaches
+    FAST_PARSER_MIN_CONFIDENCE; otherwise the caller should use the LLM.
+    """
+
+    def __init__(self, enabled: bool, min_confidence: float):
+        self.enabled = enabled
+        self.min_confidence = min_confidence
+        self.parsed = 0
+        self.fallbacks = 0
+
+    def parse(self, query: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+
+        result = analyze_query(query)
+        if result.confidence >= self.min_confidence:
+            self.parsed += 1
+            return result.response
+
+        self.fallbacks += 1
+        return None
+
+    def stats(self) -> dict:
+        total = self.parsed + self.fallbacks
+        return {
+            "parsed": self.parsed,
+            "fallbacks": self.fallbacks,
+            "parse_ratio": round(self.parsed / total, 4) if total else 0.0,
+        }
+
+
+def _create_fast_query_parser() -> FastQueryParser:
+    config = get_fast_parser_config()
+    return FastQueryParser(enabled=config["enabled"], min_confidence=config["min_confidence"])
+
+
+fast_query_parser = _create_fast_query_parser()
+
+
+def get_fast_query_parser() -> FastQueryParser:
+    """Get the application-wide fast query parser."""
+    return fast_query_parser
@@ -38,6 +38,8 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field(default="HS256", description="JWT algorithm")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, description="Access token expiration time")
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=30, description="Refresh token expiration time in days")
+    AUTH_TOKEN_CACHE_ENABLED: bool = Field(default=True, description="Cache verified access tokens until they expire")
+    AUTH_TOKEN_CACHE_MAX_SIZE: int = Field(default=10000, description="Max number of verified access tokens kept in the cache")
     
     # Server settings
     HOST: str = Field(default="0.0.0.0", description="Server host")
@@ -45,10 +47,87 @@ class Settings(BaseSettings):
 
     # LLM settings
     OPENAI_API_KEY: Optional[str] = Field(default=None, description="OpenAI API key")
+    LLM_MODEL: str = Field(default="gpt-4o-mini", description="OpenAI model used to parse search queries")
+    LLM_TIMEOUT: float = Field(default=15.0, description="OpenAI request timeout in seconds")
+    LLM_MAX_RETRIES: int = Field(default=2, description="OpenAI request retry budget")
+    FAST_PARSER_ENABLED: bool = Field(default=True, description="Parse simple queries locally before calling the LLM")
+    FAST_PARSER_MIN_CONFIDENCE: float = Field(default=0.75, description="Min fast parser confidence to skip the LLM")
+    QUERY_CACHE_TTL: float = Field(default=3600.0, description="Parsed query fields cache time to live in seconds")
+    QUERY_CACHE_MAX_SIZE: int = Field(default=10000, description="Max number of parsed queries kept in the cache")
 
     # Google API settings
     GOOGLE_API_KEY: Optional[str] = Field(default=None, description="Google API key")
 
+    # Google Places HTTP client settings
+    PLACES_HTTP2: bool = Field(default=True, description="Use HTTP/2 for Google Places API requests")
+    PLACES_MAX_CONNECTIONS: int = Field(default=100, description="Places client max open connections")
+    PLACES_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20, description="Places client max idle keep-alive connections")
+    PLACES_KEEPALIVE_EXPIRY: float = Field(default=30.0, description="Places client idle connection expiry in seconds")
+    PLACES_CONNECT_TIMEOUT: float = Field(default=5.0, description="Places client connect timeout in seconds")
+    PLACES_READ_TIMEOUT: float = Field(default=10.0, description="Places client read timeout in seconds")
+    PLACES_WRITE_TIMEOUT: float = Field(default=10.0, description="Places client write timeout in seconds")
+    PLACES_POOL_TIMEOUT: float = Field(default=5.0, description="Places client pool acquire timeout in seconds")
+    PLACES_BATCH_CONCURRENCY: int = Field(default=10, description="Max concurrent Places requests per batch fetch")
+    PLACES_BATCH_ITEM_TIMEOUT: float = Field(default=5.0, description="Per-place timeout in seconds for batch fetches")
+
+    # Place details cache settings
+    PLACE_CACHE_ENABLED: bool = Field(default=True, description="Cache place details by place_id")
+    PLACE_CACHE_BACKEND: str = Field(default="memory", description="Place cache backend: memory")
+    PLACE_CACHE_TTL: float = Field(default=3600.0, description="Place cache entry time to live in seconds")
+    PLACE_CACHE_MAX_SIZE: int = Field(default=5000, description="Max number of places kept in the cache")
+
+    # Place catalog settings
+    PLACE_CATALOG_ENABLED: bool = Field(default=True, description="Store Places payloads in the local places table")
+    PLACE_CATALOG_FRESHNESS: float = Field(default=86400.0, description="Seconds a stored place is served without refetching it from Google")
+    PLACE_CATALOG_OPEN_NOW_FRESHNESS: float = Field(default=300.0, description="Seconds a stored place is served when openNow cannot be recomputed from its opening periods")
+
+    # Local place index settings
+    LOCAL_INDEX_ENABLED: bool = Field(default=True, description="Serve searches from the in-process place index when it has enough results")
+    LOCAL_INDEX_MAX_PLACES: int = Field(default=20000, description="Max number of places kept in the local index")
+    LOCAL_INDEX_TTL: float = Field(default=1800.0, description="Seconds an indexed place can be served locally")
+    LOCAL_INDEX_CELL_SIZE: float = Field(default=0.01, description="Spatial grid cell size in degrees")
+    LOCAL_INDEX_MIN_SIMILARITY: float = Field(default=0.6, description="Min share of a query term's trigrams a place must contain")
+    LOCAL_INDEX_MIN_RESULTS: int = Field(default=5, description="Min filtered local results needed to skip the Places text search")
+    LOCAL_INDEX_COLUMNAR_MIN_CANDIDATES: int = Field(default=100, description="Min local candidates filtered with NumPy columns instead of per-place predicates")
+    SEARCH_DEFAULT_RADIUS: float = Field(default=2000.0, description="Search radius in meters around a request's latitude/longitude")
+
+    # Search pipeline settings
+    SEARCH_PARSE_TIMEOUT: float = Field(default=20.0, description="Timeout in seconds for LLM query parsing during search")
+    SEARCH_FETCH_TIMEOUT: float = Field(default=15.0, description="Timeout in seconds for the Places text search during search")
+    SEARCH_PAGE_SIZE: int = Field(default=20, description="Default Places text search page size in paging mode (max 20)")
+    SEARCH_DEFAULT_LIMIT: int = Field(default=20, description="Default number of matches returned per request in paging mode")
+    SEARCH_MAX_PAGES: int = Field(default=3, description="Maximum number of Places pages fetched per request in paging mode")
+
+    # Search count buffer settings
+    SEARCH_COUNT_FLUSH_INTERVAL: float = Field(default=2.0, description="Max seconds search count increments wait before being written")
+    SEARCH_COUNT_MAX_PENDING: int = Field(default=1000, description="Pending places that trigger an early search count flush")
+
+    # Background job queue settings
+    JOB_QUEUE_CAPACITY: int = Field(default=1000, description="Max queued background jobs before new ones are rejected")
+    JOB_QUEUE_WORKERS: int = Field(default=2, description="Concurrent background job workers")
+    JOB_QUEUE_MAX_RETRIES: int = Field(default=3, description="Retries for a failed background job")
+    JOB_QUEUE_RETRY_BACKOFF: float = Field(default=0.5, description="Initial retry delay in seconds, doubled per attempt")
+    JOB_QUEUE_DRAIN_TIMEOUT: float = Field(default=10.0, description="Seconds shutdown waits for queued background jobs")
+
+    # Trending settings
+    TRENDING_DAY_HALF_LIFE_HOURS: float = Field(default=24.0, description="Half-life of a search in the 'day' trending score")
+    TRENDING_WEEK_HALF_LIFE_HOURS: float = Field(default=168.0, description="Half-life of a search in the 'week' trending score")
+
+    # Top places settings
+    TOP_PLACES_LIMIT: int = Field(default=50, description="Max number of places kept per top places window")
+    TOP_PLACES_REFRESH_INTERVAL: float = Field(default=300.0, description="Top places refresh interval in seconds")
+    TOP_PLACES_CHANGE_THRESHOLD: int = Field(default=50, description="Search count changes that trigger an early top places refresh")
+    TOP_PLACES_COLD_WAIT: float = Field(default=5.0, description="Max seconds a request waits for the first top places snapshot")
+
+    # Favorites settings
+    FAVORITES_PAGE_SIZE: int = Field(default=50, description="Favorites returned per page when no limit is given")
+    FAVORITES_MAX_PAGE_SIZE: int = Field(default=100, description="Max favorites returned per page")
+    FAVORITES_CHECK_MAX_IDS: int = Field(default=100, description="Max place ids in one favorites status check")
+    FAVORITES_CACHE_ENABLED: bool = Field(default=True, description="Cache each user's favorite place ids in memory")
+    FAVORITES_CACHE_MAX_USERS: int = Field(default=10000, description="Max number of users whose favorites are cached")
+    FAVORITES_CACHE_TTL: float = Field(default=3600.0, description="Cached favorites time to live in seconds")
+    FAVORITES_CACHE_REVALIDATE_AFTER: float = Field(default=5.0, description="Seconds cached favorites are served before their version is checked again")
+
     # Logging settings
     LOG_LEVEL: str = Field(default="INFO", description="Logging level")
     SQL_ECHO: bool = Field(default=False, description="SQL query logging")
@@ -171,6 +250,15 @@ def get_security_config() -> dict:
     }
 
 
+def get_auth_token_cache_config() -> dict:
+    """Get verified access token cache configuration as a dictionary."""
+    return {
+        "enabled": settings.AUTH_TOKEN_CACHE_ENABLED,
+        "max_size": settings.AUTH_TOKEN_CACHE_MAX_SIZE,
+        "max_ttl": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
 def get_server_config() -> dict:
     """Get server configuration as a dictionary."""
     return {
@@ -184,6 +272,25 @@ def get_llm_config() -> dict:
     """Get LLM configuration as a dictionary."""
     return {
         "openai_api_key": settings.OPENAI_API_KEY,
+        "model": settings.LLM_MODEL,
+        "timeout": settings.LLM_TIMEOUT,
+        "max_retries": settings.LLM_MAX_RETRIES,
+    }
+
+
+def get_fast_parser_config() -> dict:
+    """Get rule-based query parser configuration as a dictionary."""
+    return {
+        "enabled": settings.FAST_PARSER_ENABLED,
+        "min_confidence": settings.FAST_PARSER_MIN_CONFIDENCE,
+    }
+
+
+def get_query_cache_config() -> dict:
+    """Get parsed query fields cache configuration as a dictionary."""
+    return {
+        "ttl": settings.QUERY_CACHE_TTL,
+        "max_size": settings.QUERY_CACHE_MAX_SIZE,
     }
 
 def get_google_api_config() -> dict:
@@ -193,5 +300,119 @@ def get_google_api_config() -> dict:
     }
 
 
+def get_places_client_config() -> dict:
+    """Get Google Places HTTP client configuration as a dictionary."""
+    return {
+        "http2": settings.PLACES_HTTP2,
+        "max_connections": settings.PLACES_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.PLACES_MAX_KEEPALIVE_CONNECTIONS,
+        "keepalive_expiry": settings.PLACES_KEEPALIVE_EXPIRY,
+        "connect_timeout": settings.PLACES_CONNECT_TIMEOUT,
+        "read_timeout": settings.PLACES_READ_TIMEOUT,
+        "write_timeout": settings.PLACES_WRITE_TIMEOUT,
+        "pool_timeout": settings.PLACES_POOL_TIMEOUT,
+        "batch_concurrency": settings.PLACES_BATCH_CONCURRENCY,
+        "batch_item_timeout": settings.PLACES_BATCH_ITEM_TIMEOUT,
+    }
+
+
+def get_place_cache_config() -> dict:
+    """Get place details cache configuration as a dictionary."""
+    return {
+        "enabled": settings.PLACE_CACHE_ENABLED,
+        "backend": settings.PLACE_CACHE_BACKEND,
+        "ttl": settings.PLACE_CACHE_TTL,
+        "max_size": settings.PLACE_CACHE_MAX_SIZE,
+    }
+
+
+def get_place_catalog_config() -> dict:
+    """Get local place catalog configuration as a dictionary."""
+    return {
+        "enabled": settings.PLACE_CATALOG_ENABLED,
+        "freshness": settings.PLACE_CATALOG_FRESHNESS,
+        "open_now_freshness": settings.PLACE_CATALOG_OPEN_NOW_FRESHNESS,
+    }
+
+
+def get_place_index_config() -> dict:
+    """Get local place index configuration as a dictionary."""
+    return {
+        "enabled": settings.LOCAL_INDEX_ENABLED,
+        "max_places": settings.LOCAL_INDEX_MAX_PLACES,
+        "ttl": settings.LOCAL_INDEX_TTL,
+        "cell_size": settings.LOCAL_INDEX_CELL_SIZE,
+        "min_similarity": settings.LOCAL_INDEX_MIN_SIMILARITY,
+        "min_results": settings.LOCAL_INDEX_MIN_RESULTS,
+        "columnar_min_candidates": settings.LOCAL_INDEX_COLUMNAR_MIN_CANDIDATES,
+        "page_size": settings.SEARCH_PAGE_SIZE,
+        "default_radius": settings.SEARCH_DEFAULT_RADIUS,
+    }
+
+
+def get_search_pipeline_config() -> dict:
+    """Get search pipeline stage timeouts as a dictionary."""
+    return {
+        "parse_timeout": settings.SEARCH_PARSE_TIMEOUT,
+        "fetch_timeout": settings.SEARCH_FETCH_TIMEOUT,
+    }
+
+
+def get_search_paging_config() -> dict:
+    """Get paged search defaults and page budget as a dictionary."""
+    return {
+        "page_size": settings.SEARCH_PAGE_SIZE,
+        "default_limit": settings.SEARCH_DEFAULT_LIMIT,
+        "max_pages": settings.SEARCH_MAX_PAGES,
+    }
+
+
+def get_job_queue_config() -> dict:
+    """Get background job queue configuration as a dictionary."""
+    return {
+        "capacity": settings.JOB_QUEUE_CAPACITY,
+        "workers": settings.JOB_QUEUE_WORKERS,
+        "max_retries": settings.JOB_QUEUE_MAX_RETRIES,
+        "retry_backoff": settings.JOB_QUEUE_RETRY_BACKOFF,
+        "drain_timeout": settings.JOB_QUEUE_DRAIN_TIMEOUT,
+    }
+
+
+def get_favorites_cache_config() -> dict:
+    """Get favorites cache configuration as a dictionary."""
+    return {
+        "enabled": settings.FAVORITES_CACHE_ENABLED,
+        "max_users": settings.FAVORITES_CACHE_MAX_USERS,
+        "ttl": settings.FAVORITES_CACHE_TTL,
+        "revalidate_after": settings.FAVORITES_CACHE_REVALIDATE_AFTER,
+    }
+
+
+def get_search_count_config() -> dict:
+    """Get search count buffer configuration as a dictionary."""
+    return {
+        "flush_interval": settings.SEARCH_COUNT_FLUSH_INTERVAL,
+        "max_pending": settings.SEARCH_COUNT_MAX_PENDING,
+    }
+
+
+def get_trending_config() -> dict:
+    """Get trending score decay configuration as a dictionary."""
+    return {
+        "day_half_life_hours": settings.TRENDING_DAY_HALF_LIFE_HOURS,
+        "week_half_life_hours": settings.TRENDING_WEEK_HALF_LIFE_HOURS,
+    }
+
+
+def get_top_places_config() -> dict:
+    """Get top places cache configuration as a dictionary."""
+    return {
+        "limit": settings.TOP_PLACES_LIMIT,
+        "refresh_interval": settings.TOP_PLACES_REFRESH_INTERVAL,
+        "change_threshold": settings.TOP_PLACES_CHANGE_THRESHOLD,
+        "cold_wait": settings.TOP_PLACES_COLD_WAIT,
+    }
+
+
 
 
@@ -1,6 +1,7 @@
 from .models.user import UserModel
 from .models.favorite_places import FavoritePlaceModel
 from .models.search_count import PlaceSearchCountModel
+from .models.place import PlaceModel
 from .config import (
     get_db,
     get_db_session,
@@ -15,6 +16,7 @@ __all__ = [
     "UserModel",
     "FavoritePlaceModel",
     "PlaceSearchCountModel",
+    "PlaceModel",
     "get_db",
     "get_db_session",
     "get_async_db",
@@ -1,6 +1,7 @@
 import os
 import logging
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.sql import func
@@ -117,6 +118,30 @@ async def get_async_session():
         logger.error(f"Failed to create async database session: {e}")
         raise
 
+def add_missing_columns():
+    """
+    Add model columns and indexes missing from existing tables.
+
+    create_all only creates whole tables, so new nullable columns on
+    tables that already exist are added here (ADD COLUMN IF NOT EXISTS).
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {column_ddl}'))
+                logger.info(f"Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
 def init_db():
     """Initialize database with tables and production logging"""
     try:
@@ -133,6 +158,8 @@ def init_db():
             logger.info("Tables created successfully")
         else:
             logger.info("Tables already exist, skipping creation")
+
+        add_missing_columns()
         
         # Log pool status
         pool_status = get_pool_status()
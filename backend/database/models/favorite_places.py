@@ -1,4 +1,4 @@
-from sqlalchemy import String, DateTime, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import String, DateTime, Integer, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from .base import Base
@@ -22,6 +22,8 @@ class FavoritePlaceModel(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "place_id", name="uq_user_place"),
+        # Keyset pagination of one user's favorites (scanned backwards for newest first)
+        Index("idx_favorites_user_created", "user_id", "created_at", "id"),
     )
 
     def __repr__(self):
@@ -0,0 +1,47 @@
+from typing import Optional
+from sqlalchemy import String, DateTime, Float, Boolean, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class PlaceModel(Base):
+    __tablename__ = "places"
+
+    # 🔹 Google Maps Place ID
+    place_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    # 🔹 Places API payload, merged across responses with different field masks
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # Typed copies of commonly filtered fields
+    name: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    rating: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    price_level: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    price_start: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    price_end: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    primary_type: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    business_status: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    allows_dogs: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    delivery: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    dine_in: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    reservable: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    outdoor_seating: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    serves_breakfast: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    serves_lunch: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    serves_dinner: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    serves_coffee: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    serves_vegetarian_food: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+
+    fetched_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("idx_places_rating", rating.desc()),
+        Index("idx_places_fetched_at", fetched_at),
+    )
+
+    def __repr__(self):
+        return f"<PlaceModel(place_id='{self.place_id}', name='{self.name}', fetched_at={self.fetched_at})>"
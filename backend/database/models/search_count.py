@@ -1,4 +1,5 @@
-from sqlalchemy import String, Integer, DateTime, CheckConstraint, Index
+from typing import Optional
+from sqlalchemy import String, Integer, DateTime, Float, CheckConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from .base import Base
@@ -13,9 +14,16 @@ class PlaceSearchCountModel(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    # 🔹 Exponentially decayed search counts, stored in the log domain
+    # (see functionalities/search/trending.py); NULL until first searched
+    trend_day: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    trend_week: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
     __table_args__ = (
         CheckConstraint("search_count >= 0", name="check_search_count_nonnegative"),
         Index("idx_search_count", search_count.desc()),  
+        Index("idx_trend_day", trend_day.desc().nullslast()),
+        Index("idx_trend_week", trend_week.desc().nullslast()),
     )
 
     def __repr__(self):
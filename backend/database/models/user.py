@@ -19,6 +19,9 @@ class UserModel(Base):
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
+    # Bumped by every favorites toggle; lets each worker tell whether its cached favorites are current
+    favorites_version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
     __table_args__ = (
         CheckConstraint(
             "email ~* '^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'",
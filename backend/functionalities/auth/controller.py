@@ -1,14 +1,13 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from utils.auth import get_current_user_id
 from .models import UserLogin, Token, RefreshTokenRequest, UserRegister, PasswordChangeRequest
 from .service import AuthService, get_auth_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
-security = HTTPBearer()
 
 
 @router.post("/login", response_model=Token)
@@ -91,15 +90,14 @@ async def refresh_token(refresh_request: RefreshTokenRequest, auth_service: Auth
         )
 
 @router.get("/me")
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security),
+async def get_current_user(user_id: int = Depends(get_current_user_id),
                            auth_service: AuthService = Depends(get_auth_service)):
     """
     Get current user information.
     """
     logger.info("Get current user attempt")
     try:
-        token = credentials.credentials
-        result = await auth_service.get_user(token)
+        result = await auth_service.get_user(user_id)
         logger.info("Get current user successful")
         return result
 
@@ -117,7 +115,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 @router.patch("/change-password")
 async def change_password(
     password_request: PasswordChangeRequest,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_id: int = Depends(get_current_user_id),
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """
@@ -125,8 +123,7 @@ async def change_password(
     """
     logger.info("Password change attempt")
     try:
-        token = credentials.credentials
-        result = await auth_service.change_password(token, password_request)
+        result = await auth_service.change_password(user_id, password_request)
         logger.info("Password change successful")
         return result
 
@@ -5,7 +5,7 @@ from database.config import get_async_db
 from fastapi import Depends, HTTPException, status
 from .models import User, RefreshTokenRequest, UserRegister, UserLogin, UserUpdate, UserCreate, PasswordChangeRequest
 from sqlalchemy.ext.asyncio import AsyncSession
-from utils.jwt import create_access_token, create_refresh_token, verify_refresh_token, get_user_id_from_token
+from utils.jwt import create_access_token, create_refresh_token, verify_refresh_token
 from utils.password import verify_password, get_password_hash
 
 # Configure logging
@@ -141,10 +141,8 @@ class AuthService:
                 detail="Sunucu hatası"
             )
 
-    async def get_user(self, token: str):
+    async def get_user(self, user_id: int):
         try:
-            user_id = get_user_id_from_token(token)
-
             user = await self.auth_adapter.get_user_by_id(user_id)
             if not user:
                 raise HTTPException(
@@ -165,10 +163,8 @@ class AuthService:
                 detail="Sunucu hatası"
             )
 
-    async def update_user(self, token: str, user: User):
+    async def update_user(self, user_id: int, user: User):
         try:
-            user_id = get_user_id_from_token(token)
-
             existing_user = await self.auth_adapter.get_user_by_id(user_id)
             if not existing_user:
                 raise HTTPException(
@@ -195,10 +191,8 @@ class AuthService:
                 detail="Sunucu hatası"
             )
 
-    async def change_password(self, token: str, password_request: PasswordChangeRequest):
+    async def change_password(self, user_id: int, password_request: PasswordChangeRequest):
         try:
-            user_id = get_user_id_from_token(token)
-
             existing_user = await self.auth_adapter.get_user_by_id(user_id)
             if not existing_user:
                 raise HTTPException(
@@ -226,10 +220,8 @@ class AuthService:
                 detail="Sunucu hatası"
             )
 
-    async def delete_user(self, token: str):
+    async def delete_user(self, user_id: int):
         try:
-            user_id = get_user_id_from_token(token)
-
             await self.auth_adapter.delete_user(user_id)
 
             return {"message": "Kullanıcı silindi"}
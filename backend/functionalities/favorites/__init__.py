@@ -1,3 +1,4 @@
 from .controller import router
+from .cache import FavoritesCache, favorites_cache, get_favorites_cache
 
-__all__ = ["router"]
+__all__ = ["router", "FavoritesCache", "favorites_cache", "get_favorites_cache"]
@@ -1,16 +1,45 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from sqlalchemy import select, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import func, select, text, tuple_
 import logging
-import httpx
-from database import FavoritePlaceModel
-from functionalities.search.models import CafeResponse, PriceRange, OpeningHours, PriceDetail
-from config import settings
+from database import FavoritePlaceModel, PlaceModel
+from functionalities.search.models import CafeResponse
+from functionalities.search.converter import convert_places
+from places import PlacesClient, create_place_catalog
+from .paging import FavoritesCursor
+from .statuses import get_favorite_statuses
+from .cache import get_favorites_cache
 
 logger = logging.getLogger(__name__)
 
 
+# Toggle as one statement. The delete waits for bumped, so every toggle of a
+# user locks the user row before any favorite row; otherwise two toggles
+# could take the two locks in opposite order and deadlock. Plain SQL, as
+# SQLAlchemy cannot cache an INSERT ... SELECT inside a CTE and would
+# compile the ORM form again on every toggle.
+_TOGGLE_FAVORITE = text("""
+    WITH bumped AS (
+        UPDATE users SET favorites_version = favorites_version + 1
+        WHERE id = :user_id
+        RETURNING id, favorites_version
+    ), deleted AS (
+        DELETE FROM favorite_places
+        WHERE user_id = (SELECT id FROM bumped) AND place_id = :place_id
+        RETURNING id
+    ), inserted AS (
+        INSERT INTO favorite_places (user_id, place_id)
+        SELECT :user_id, :place_id
+        WHERE NOT EXISTS (SELECT FROM deleted)
+        ON CONFLICT ON CONSTRAINT uq_user_place DO NOTHING
+        RETURNING id
+    )
+    SELECT EXISTS (SELECT FROM deleted), EXISTS (SELECT FROM inserted),
+           (SELECT favorites_version FROM bumped)
+""")
+
+
 class FavoritesAdapter:
     """
     Favorites adapter for database operations.
@@ -19,214 +48,146 @@ class FavoritesAdapter:
     with proper error handling and session management.
     """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, places_client: PlacesClient):
         self.db: AsyncSession = session
-
-    async def get_user_favorites(self, user_id: int) -> List[CafeResponse]:
+        self.places_client: PlacesClient = places_client
+        self.catalog = create_place_catalog(session, places_client)
+        self.favorites_cache = get_favorites_cache()
+
+    async def get_user_favorites(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: Optional[FavoritesCursor] = None
+    ) -> Tuple[List[CafeResponse], Optional[FavoritesCursor]]:
         """
-        Get all favorite places for a given user with full cafe details.
-        
+        Get one page of a user's favorite places with full cafe details,
+        newest first.
+
+        Details come from one join against the places catalog; only
+        missing or stale places are fetched from Google, concurrently.
+
         Args:
             user_id: Internal user ID
-            
+            limit: Max favorites in the page
+            cursor: Position after the previous page, None for the first page
+
         Returns:
-            List of CafeResponse objects (empty if none)
+            Cafes in the page (empty on error) and the cursor of the next page,
+            None when this is the last one
         """
         try:
-            stmt = select(FavoritePlaceModel.place_id).where(FavoritePlaceModel.user_id == user_id)
+            stmt = (
+                select(
+                    FavoritePlaceModel.place_id,
+                    PlaceModel.payload,
+                    PlaceModel.fetched_at,
+                    FavoritePlaceModel.created_at,
+                    FavoritePlaceModel.id,
+                )
+                .outerjoin(PlaceModel, PlaceModel.place_id == FavoritePlaceModel.place_id)
+                .where(FavoritePlaceModel.user_id == user_id)
+                .order_by(FavoritePlaceModel.created_at.desc(), FavoritePlaceModel.id.desc())
+                # One extra row tells whether another page exists
+                .limit(limit + 1)
+            )
+            if cursor is not None:
+                stmt = stmt.where(
+                    tuple_(FavoritePlaceModel.created_at, FavoritePlaceModel.id) < tuple_(cursor.created_at, cursor.id)
+                )
             result = await self.db.execute(stmt)
-            place_ids = result.scalars().all()
-
-            cafes = []
-            
-            for place_id in place_ids:
-                try:
-                    URL = f"https://places.googleapis.com/v1/places/{place_id}"
-                    
-                    HEADERS = {
-                        "Content-Type": "application/json",
-                        "X-Goog-Api-Key": settings.GOOGLE_API_KEY,
-                        "X-Goog-FieldMask": "id,displayName,rating,formattedAddress,internationalPhoneNumber,googleMapsUri,businessStatus,primaryType,priceRange,currentOpeningHours,photos,allowsDogs,delivery,reservable,servesBreakfast,servesLunch,servesDinner,servesVegetarianFood"
-                    }
-                    
-                    with httpx.Client() as client:
-                        response = client.get(URL, headers=HEADERS)
-                        if response.status_code == 200:
-                            place_data = response.json()
-                            cafe = self._convert_to_cafe_response(place_data)
-                            cafes.append(cafe)
-                        else:
-                            logger.warning(f"Failed to fetch place {place_id}: {response.status_code}")
-                            
-                except Exception as e:
-                    logger.warning(f"Failed to fetch place {place_id}: {e}")
-                    continue
-            
-            return cafes
+            rows = result.all()
+
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = FavoritesCursor(rows[-1].created_at, rows[-1].id)
+
+            places = await self.catalog.complete([(row.place_id, row.payload, row.fetched_at) for row in rows])
+            return convert_places(places), next_cursor
 
         except SQLAlchemyError as e:
             logger.error(f"Database error retrieving favorites for user {user_id}: {e}")
-            return []
+            return [], None
         except Exception as e:
             logger.error(f"Unexpected error retrieving favorites for user {user_id}: {e}")
-            return []
+            return [], None
 
-    async def add_favorite(self, user_id: int, place_id: str) -> bool:
-        """
-        Add a place to user's favorites.
-        
-        Returns True if added, False if already exists or error.
+    async def count_favorites(self, user_id: int) -> int:
         """
-        try:
-            new_fav = FavoritePlaceModel(user_id=user_id, place_id=place_id)
-            self.db.add(new_fav)
-            await self.db.commit()
-            return True
-
-        except IntegrityError:
-            # duplicate entry
-            await self.db.rollback()
-            return False
+        Count all of a user's favorites, across pages.
 
-        except Exception as e:
-            await self.db.rollback()
-            logger.error(f"Error adding favorite for user {user_id}, place {place_id}: {e}")
-            return False
+        With the favorites cache enabled this is the size of the user's
+        cached ids; otherwise a count(*) served by idx_favorites_user_created.
 
-    async def remove_favorite(self, user_id: int, place_id: str) -> bool:
-        """
-        Remove a place from user's favorites.
-        Returns True if deleted, False if not found or error.
+        Returns:
+            Number of favorites (0 on error)
         """
         try:
-            stmt = delete(FavoritePlaceModel).where(
-                FavoritePlaceModel.user_id == user_id,
-                FavoritePlaceModel.place_id == place_id
-            ).returning(FavoritePlaceModel.id)
-            
-            result = await self.db.execute(stmt)
-            await self.db.commit()
+            cache = get_favorites_cache()
+            if cache.enabled:
+                return len(await cache.get(self.db, user_id))
 
-            return result.rowcount > 0
+            stmt = select(func.count()).select_from(FavoritePlaceModel).where(FavoritePlaceModel.user_id == user_id)
+            result = await self.db.execute(stmt)
+            return result.scalar_one()
 
+        except SQLAlchemyError as e:
+            logger.error(f"Database error counting favorites for user {user_id}: {e}")
+            return 0
         except Exception as e:
-            await self.db.rollback()
-            logger.error(f"Error removing favorite for user {user_id}, place {place_id}: {e}")
-            return False
+            logger.error(f"Unexpected error counting favorites for user {user_id}: {e}")
+            return 0
 
     async def is_favorite(self, user_id: int, place_id: str) -> bool:
         """
         Check if a user has already favorited a place.
         Returns True if exists, False otherwise.
         """
-        try:
-            stmt = select(FavoritePlaceModel).where(
-                FavoritePlaceModel.user_id == user_id,
-                FavoritePlaceModel.place_id == place_id
-            )
-            result = await self.db.execute(stmt)
-            fav = result.scalar_one_or_none()
-            return fav is not None
+        statuses = await self.get_favorite_statuses(user_id, [place_id])
+        return statuses[place_id]
 
-        except Exception as e:
-            logger.error(f"Error checking favorite for user {user_id}, place {place_id}: {e}")
-            return False
+    async def get_favorite_statuses(self, user_id: int, place_ids: Sequence[str]) -> Dict[str, bool]:
+        """
+        Check which of several places a user has favorited, in one query.
+
+        Returns:
+            Map of every given place id to its favorite status (all False on error)
+        """
+        return await get_favorite_statuses(self.db, user_id, place_ids)
 
     async def toggle_favorite(self, user_id: int, place_id: str) -> bool:
         """
         Toggle a favorite: add if not exists, remove if exists.
-        Returns True if added, False if removed.
-        """
-        if await self.is_favorite(user_id, place_id):
-            await self.remove_favorite(user_id, place_id)
-            return False  
-        else:
-            await self.add_favorite(user_id, place_id)
-            return True
-
-    def _convert_to_cafe_response(self, place_data: dict) -> CafeResponse:
-        """
-        Convert Google Places API response to CafeResponse model
+
+        Runs as one statement (_TOGGLE_FAVORITE), so it is normally a
+        single round trip and concurrent toggles of the same pair cannot
+        interleave between check and write. If neither the delete nor the
+        insert took effect, a concurrent toggle added the row after this
+        statement's snapshot; the user row is locked by then, so running
+        the statement once more sees that row and removes it. The bumped
+        version is written through to the favorites cache.
+
+        Returns:
+            True if the place is now a favorite, False if it was removed
+
+        Raises:
+            SQLAlchemyError: If the statement fails
         """
-        place_id = place_data.get("id")
-        
-        display_name = place_data.get("displayName", {})
-        name = display_name.get("text") 
-        
-        return CafeResponse(
-            id=place_id,
-            name=name,
-            rating=place_data.get("rating"),
-            address=place_data.get("formattedAddress"),
-            phone=place_data.get("internationalPhoneNumber"),
-            google_maps_uri=place_data.get("googleMapsUri"),
-            business_status=place_data.get("businessStatus"),
-            primary_type=place_data.get("primaryType").replace("_", " ") if place_data.get("primaryType") else None,
-            price_range=self._convert_price_range(place_data.get("priceRange")),
-            opening_hours=self._convert_opening_hours(place_data.get("currentOpeningHours")),
-            photos=self._convert_photos(place_data.get("photos")),
-            allows_dogs=place_data.get("allowsDogs"),
-            delivery=place_data.get("delivery"),
-            reservable=place_data.get("reservable"),
-            serves_breakfast=place_data.get("servesBreakfast"),
-            serves_lunch=place_data.get("servesLunch"),
-            serves_dinner=place_data.get("servesDinner"),
-            serves_vegetarian_food=place_data.get("servesVegetarianFood")
-        )
-     
-    def _convert_price_range(self, price_range_data) -> Optional[PriceRange]:
-        """Convert price range data to PriceRange model"""
-        if not price_range_data:
-            return None
-        
-        try:
-            start_price = None
-            end_price = None
-            
-            if "startPrice" in price_range_data:
-                start_data = price_range_data["startPrice"]
-                start_price = PriceDetail(
-                    currencyCode=start_data.get("currencyCode", ""),
-                    units=start_data.get("units", "")
-                )
-            
-            if "endPrice" in price_range_data:
-                end_data = price_range_data["endPrice"]
-                end_price = PriceDetail(
-                    currencyCode=end_data.get("currencyCode", ""),
-                    units=end_data.get("units", "")
-                )
-            
-            return PriceRange(startPrice=start_price, endPrice=end_price)
-        except Exception:
-            return None
-    
-    def _convert_opening_hours(self, opening_hours_data) -> Optional[OpeningHours]:
-        """Convert opening hours data to OpeningHours model"""
-        if not opening_hours_data:
-            return None
-        
+        params = {"user_id": user_id, "place_id": place_id}
         try:
-            return OpeningHours(
-                openNow=opening_hours_data.get("openNow"),
-                weekdayDescriptions=opening_hours_data.get("weekdayDescriptions"),
-            )
-        except Exception:
-            return None
-    
-    def _convert_photos(self, photos_data) -> Optional[List[str]]:
-        """Convert photos data to list of photo URLs"""
-        if not photos_data or not isinstance(photos_data, list):
-            return None
-        
-        try:
-            photos = []
-            for photo_data in photos_data:
-                if isinstance(photo_data, dict) and "name" in photo_data:
-                    name = photo_data.get("name")
-                    photo_url = f"https://places.googleapis.com/v1/{name}/media?key={settings.GOOGLE_API_KEY}&maxHeightPx=600&maxWidthPx=600"
-                    photos.append(photo_url)
-            
-            return photos if photos else None
-        except Exception:
-            return None
+            removed, inserted, version = (await self.db.execute(_TOGGLE_FAVORITE, params)).one()
+            if not removed and not inserted:
+                removed, inserted, version = (await self.db.execute(_TOGGLE_FAVORITE, params)).one()
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error toggling favorite for user {user_id}, place {place_id}: {e}")
+            raise
+
+        added = not removed
+        self.favorites_cache.apply_toggle(user_id, place_id, added, version)
+        if added:
+            # Snapshot the place now, so the favorites list does not wait on Google
+            self.catalog.warm_later([place_id])
+        return added
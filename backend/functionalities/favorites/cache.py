@@ -0,0 +1,126 @@
+import logging
+import time
+from typing import AbstractSet, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_favorites_cache_config
+from database import FavoritePlaceModel, UserModel
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("version", "place_ids", "checked_at")
+
+    def __init__(self, version: Optional[int], place_ids: Set[str], checked_at: float):
+        self.version = version
+        self.place_ids = place_ids
+        self.checked_at = checked_at
+
+
+class FavoritesCache:
+    """
+    Per-user set of favorite place ids, cached in memory (LRU over users).
+
+    Each entry carries the user's favorites_version, which every toggle
+    bumps in the same statement. An entry checked within revalidate_after
+    seconds is served as is; after that a primary-key lookup of the
+    version decides whether it is still current or was changed by another
+    worker and must be reloaded. Toggles in this worker write through:
+    the entry is updated in place when the toggle's version directly
+    follows the cached one, and dropped otherwise.
+    """
+
+    def __init__(self, max_users: int, ttl: float, revalidate_after: float, enabled: bool = True):
+        self._cache = TTLCache(max_size=max_users, ttl=ttl)
+        self.revalidate_after = revalidate_after
+        self.enabled = enabled
+        self.loads = 0
+        self.revalidations = 0
+        self.write_throughs = 0
+        self.invalidations = 0
+
+    async def _load(self, session: AsyncSession, user_id: int) -> Tuple[Optional[int], Set[str]]:
+        # Version and ids in one round trip; a user without favorites yields one row with a NULL place_id
+        stmt = (
+            select(UserModel.favorites_version, FavoritePlaceModel.place_id)
+            .outerjoin(FavoritePlaceModel, FavoritePlaceModel.user_id == UserModel.id)
+            .where(UserModel.id == user_id)
+        )
+        rows = (await session.execute(stmt)).all()
+        version = rows[0][0] if rows else None
+        return version, {place_id for _, place_id in rows if place_id is not None}
+
+    async def _version(self, session: AsyncSession, user_id: int) -> Optional[int]:
+        stmt = select(UserModel.favorites_version).where(UserModel.id == user_id)
+        return (await session.execute(stmt)).scalar_one_or_none()
+
+    async def get(self, session: AsyncSession, user_id: int) -> AbstractSet[str]:
+        """
+        Get the user's favorite place ids, loading them on a miss or a
+        version change.
+
+        Raises:
+            SQLAlchemyError: If the ids or the version cannot be read
+        """
+        now = time.monotonic()
+        entry: Optional[_Entry] = self._cache.get(user_id)
+        if entry is not None:
+            if now - entry.checked_at < self.revalidate_after:
+                return entry.place_ids
+
+            self.revalidations += 1
+            if await self._version(session, user_id) == entry.version:
+                entry.checked_at = now
+                return entry.place_ids
+
+        version, place_ids = await self._load(session, user_id)
+        self.loads += 1
+        self._cache.set(user_id, _Entry(version, place_ids, now))
+        return place_ids
+
+    def apply_toggle(self, user_id: int, place_id: str, added: bool, version: Optional[int]) -> None:
+        """Write a committed toggle through to the user's cached set, if any."""
+        entry: Optional[_Entry] = self._cache.peek(user_id)
+        if entry is None:
+            return
+
+        if version is not None and entry.version is not None and entry.version + 1 == version:
+            if added:
+                entry.place_ids.add(place_id)
+            else:
+                entry.place_ids.discard(place_id)
+            entry.version = version
+            self.write_throughs += 1
+        else:
+            # Another worker toggled in between; reload on next use
+            self._cache.delete(user_id)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats(),
+            "loads": self.loads,
+            "revalidations": self.revalidations,
+            "write_throughs": self.write_throughs,
+            "invalidations": self.invalidations,
+        }
+
+
+def _create_favorites_cache() -> FavoritesCache:
+    config = get_favorites_cache_config()
+    return FavoritesCache(
+        max_users=config["max_users"],
+        ttl=config["ttl"],
+        revalidate_after=config["revalidate_after"],
+        enabled=config["enabled"],
+    )
+
+
+favorites_cache = _create_favorites_cache()
+
+
+def get_favorites_cache() -> FavoritesCache:
+    """Get the application-wide favorites cache."""
+    return favorites_cache
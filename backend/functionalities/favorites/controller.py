@@ -1,19 +1,20 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from .service import FavoritesService, get_favorites_service
-from .models import FavoritesListResponse
+from .models import FavoritesCheckRequest, FavoritesListResponse
+from functionalities.search.converter import json_response
+from config import settings
+from utils.auth import get_current_user_id
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/favorites", tags=["favorites"])
-security = HTTPBearer()
-
 
 @router.post("/toggle", response_model=bool)
 async def toggle_favorite(
     place_id: str, 
-    credentials: HTTPAuthorizationCredentials = Depends(security), 
+    user_id: int = Depends(get_current_user_id),
     favorites_service: FavoritesService = Depends(get_favorites_service)
 ):
     """
@@ -21,15 +22,14 @@ async def toggle_favorite(
     
     Args:
         place_id: Google Places API place ID
-        credentials: JWT token from Authorization header
+        user_id: Authenticated user's ID, from the bearer token
         
     Returns:
         True if added to favorites, False if removed from favorites
     """
     logger.info(f"Toggle favorite attempt for place: {place_id}")
     try:
-        token = credentials.credentials
-        result = await favorites_service.toggle_favorite(token, place_id)
+        result = await favorites_service.toggle_favorite(user_id, place_id)
         logger.info(f"Toggle favorite successful for place: {place_id}, result: {result}")
         return result
     except HTTPException as e:
@@ -45,24 +45,27 @@ async def toggle_favorite(
 
 @router.get("/", response_model=FavoritesListResponse)
 async def get_user_favorites(
-    credentials: HTTPAuthorizationCredentials = Depends(security), 
+    limit: int = Query(default=settings.FAVORITES_PAGE_SIZE, ge=1, le=settings.FAVORITES_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    user_id: int = Depends(get_current_user_id),
     favorites_service: FavoritesService = Depends(get_favorites_service)
 ):
     """
-    Get all favorite places for the authenticated user.
+    Get the authenticated user's favorite places, newest first, one page at a time.
     
     Args:
-        credentials: JWT token from Authorization header
+        limit: Max favorites in the page
+        cursor: next_cursor from the previous page
+        user_id: Authenticated user's ID, from the bearer token
         
     Returns:
-        FavoritesListResponse containing list of favorite cafes with full details
+        FavoritesListResponse containing a page of favorite cafes with full details
     """
     logger.info("Get user favorites attempt")
     try:
-        token = credentials.credentials
-        result = await favorites_service.get_user_favorites(token)
+        result = await favorites_service.get_user_favorites(user_id, limit, cursor)
         logger.info(f"Get user favorites successful, found {result.total} favorites")
-        return result
+        return json_response(result)
     except HTTPException as e:
         logger.error(f"HTTP error during get user favorites: {e.detail}")
         raise
@@ -77,7 +80,7 @@ async def get_user_favorites(
 @router.get("/check", response_model=bool)
 async def is_favorite(
     place_id: str, 
-    credentials: HTTPAuthorizationCredentials = Depends(security), 
+    user_id: int = Depends(get_current_user_id),
     favorites_service: FavoritesService = Depends(get_favorites_service)
 ):
     """
@@ -85,15 +88,14 @@ async def is_favorite(
     
     Args:
         place_id: Google Places API place ID
-        credentials: JWT token from Authorization header
+        user_id: Authenticated user's ID, from the bearer token
         
     Returns:
         True if place is favorited, False otherwise
     """
     logger.info(f"Check if place is favorite attempt for place: {place_id}")
     try:
-        token = credentials.credentials
-        result = await favorites_service.is_favorite(token, place_id)
+        result = await favorites_service.is_favorite(user_id, place_id)
         logger.info(f"Check if place is favorite successful for place: {place_id}, result: {result}")
         return result
     except HTTPException as e:
@@ -105,3 +107,36 @@ async def is_favorite(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
         )
+
+
+@router.post("/check-many", response_model=Dict[str, bool])
+async def check_many(
+    request: FavoritesCheckRequest,
+    user_id: int = Depends(get_current_user_id),
+    favorites_service: FavoritesService = Depends(get_favorites_service)
+):
+    """
+    Check the favorite status of several places in one request, e.g. for
+    every card of a search result page.
+    
+    Args:
+        request: Place IDs to check
+        user_id: Authenticated user's ID, from the bearer token
+        
+    Returns:
+        Map of place ID to True if favorited, False otherwise
+    """
+    logger.info(f"Check favorites attempt for {len(request.place_ids)} places")
+    try:
+        result = await favorites_service.check_many(user_id, request.place_ids)
+        logger.info(f"Check favorites successful, {sum(result.values())} of {len(result)} favorited")
+        return result
+    except HTTPException as e:
+        logger.error(f"HTTP error during check favorites: {e.detail}")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during check favorites: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
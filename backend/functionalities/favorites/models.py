@@ -1,5 +1,6 @@
-from typing import List
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from config import settings
 from functionalities.search.models import CafeResponse
 
 
@@ -12,4 +13,11 @@ class FavoriteResponse(BaseModel):
 class FavoritesListResponse(BaseModel):
     """Response model for getting user favorites"""
     cafes: List[CafeResponse]
+    # All of the user's favorites, not just this page
     total: int
+    next_cursor: Optional[str] = None
+
+
+class FavoritesCheckRequest(BaseModel):
+    """Request model for checking the favorite status of several places"""
+    place_ids: List[str] = Field(..., min_length=1, max_length=settings.FAVORITES_CHECK_MAX_IDS)
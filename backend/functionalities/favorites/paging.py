@@ -0,0 +1,40 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import NamedTuple
+from functionalities.search.paging import InvalidCursorError
+
+
+class FavoritesCursor(NamedTuple):
+    """
+    Position in a user's favorites, newest first: the created_at and id
+    of the last favorite the client has received.
+    """
+    created_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        raw = json.dumps({"c": self.created_at.isoformat(), "i": self.id}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "FavoritesCursor":
+        """
+        Decode a cursor produced by encode().
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            data = json.loads(raw)
+            created_at, favorite_id = datetime.fromisoformat(data["c"]), data["i"]
+        except (binascii.Error, ValueError, TypeError, KeyError, AttributeError) as e:
+            raise InvalidCursorError(f"Malformed favorites cursor: {e}")
+
+        if created_at.tzinfo is None:
+            raise InvalidCursorError("Favorites cursor timestamp must include a timezone")
+        if not isinstance(favorite_id, int) or isinstance(favorite_id, bool):
+            raise InvalidCursorError("Favorites cursor id must be an integer")
+        return cls(created_at, favorite_id)
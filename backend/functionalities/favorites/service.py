@@ -1,10 +1,13 @@
-from fastapi import Depends
+from typing import Dict, List, Optional
+from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 from database import get_async_db
-from utils.jwt import get_user_id_from_token
+from places import get_places_client
 from .adapter import FavoritesAdapter
 from .models import FavoritesListResponse
+from .paging import FavoritesCursor
+from functionalities.search.paging import InvalidCursorError
 
 logger = logging.getLogger(__name__)
 
@@ -13,98 +16,108 @@ class FavoritesService:
     """
     Service layer for favorites functionality.
     
-    Handles business logic for favorite operations including
-    authentication and data validation.
+    Handles business logic for favorite operations for an already
+    authenticated user (see utils.auth.get_current_user_id).
     """
     
     def __init__(self, favorites_adapter: FavoritesAdapter):
         self.favorites_adapter = favorites_adapter
     
-    async def get_user_favorites(self, token: str) -> FavoritesListResponse:
+    async def get_user_favorites(self, user_id: int, limit: int, cursor: Optional[str] = None) -> FavoritesListResponse:
         """
-        Get all favorite places for the authenticated user.
+        Get one page of favorite places for the authenticated user, newest first.
         
         Args:
-            token: JWT access token
+            user_id: Authenticated user's internal ID
+            limit: Max favorites in the page
+            cursor: next_cursor of the previous page, None for the first page
             
         Returns:
-            FavoritesListResponse with list of favorite cafes
+            FavoritesListResponse with the page's cafes and the user's total number of
+            favorites; next_cursor is set when more favorites exist
             
         Raises:
-            HTTPException: If token is invalid or user not found
+            HTTPException: If the cursor is malformed
         """
         try:
-            user_id = get_user_id_from_token(token)
-            
-            if not user_id:
-                raise ValueError("Invalid token: missing user_id")
-            
-            cafes = await self.favorites_adapter.get_user_favorites(user_id)
+            start = FavoritesCursor.decode(cursor) if cursor else None
+            cafes, next_cursor = await self.favorites_adapter.get_user_favorites(user_id, limit, start)
+            total = await self.favorites_adapter.count_favorites(user_id)
             
             return FavoritesListResponse(
                 cafes=cafes,
-                total=len(cafes)
+                total=total,
+                next_cursor=next_cursor.encode() if next_cursor else None
+            )
+
+        except InvalidCursorError as e:
+            logger.warning(f"Invalid favorites cursor: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Geçersiz sayfa imleci"
             )
-            
         except Exception as e:
             logger.error(f"Error getting user favorites: {e}")
             raise
     
-    async def toggle_favorite(self, token: str, place_id: str) -> bool:
+    async def toggle_favorite(self, user_id: int, place_id: str) -> bool:
         """
         Toggle favorite status for a place.
         
         Args:
-            token: JWT access token
+            user_id: Authenticated user's internal ID
             place_id: Google Places API place ID
             
         Returns:
             True if added to favorites, False if removed
-            
-        Raises:
-            HTTPException: If token is invalid or operation fails
         """
         try:
-            user_id = get_user_id_from_token(token)
-            
-            if not user_id:
-                raise ValueError("Invalid token: missing user_id")
-            
             return await self.favorites_adapter.toggle_favorite(user_id, place_id)
             
         except Exception as e:
             logger.error(f"Error toggling favorite for place {place_id}: {e}")
             raise
     
-    async def is_favorite(self, token: str, place_id: str) -> bool:
+    async def is_favorite(self, user_id: int, place_id: str) -> bool:
         """
         Check if a place is favorited by the authenticated user.
         
         Args:
-            token: JWT access token
+            user_id: Authenticated user's internal ID
             place_id: Google Places API place ID
             
         Returns:
             True if place is favorited, False otherwise
-            
-        Raises:
-            HTTPException: If token is invalid
         """
         try:
-            user_id = get_user_id_from_token(token)
-            
-            if not user_id:
-                raise ValueError("Invalid token: missing user_id")
-            
             return await self.favorites_adapter.is_favorite(user_id, place_id)
             
         except Exception as e:
             logger.error(f"Error checking if place {place_id} is favorite: {e}")
             raise
 
+    
+    async def check_many(self, user_id: int, place_ids: List[str]) -> Dict[str, bool]:
+        """
+        Check the favorite status of several places at once.
+        
+        Args:
+            user_id: Authenticated user's internal ID
+            place_ids: Google Places API place IDs
+            
+        Returns:
+            Map of place ID to True if favorited, False otherwise
+        """
+        try:
+            return await self.favorites_adapter.get_favorite_statuses(user_id, place_ids)
+            
+        except Exception as e:
+            logger.error(f"Error checking favorite status of {len(place_ids)} places: {e}")
+            raise
+
 
 def get_favorites_service(
         db: AsyncSession = Depends(get_async_db),
 ) -> FavoritesService:
-    favorites_adapter = FavoritesAdapter(db)
+    favorites_adapter = FavoritesAdapter(db, get_places_client())
     return FavoritesService(favorites_adapter)
@@ -0,0 +1,72 @@
+import logging
+from typing import AbstractSet, Dict, Sequence
+from sqlalchemy import String, any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import FavoritePlaceModel
+from .cache import get_favorites_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def get_favorite_statuses(session: AsyncSession, user_id: int, place_ids: Sequence[str]) -> Dict[str, bool]:
+    """
+    Check which of several places a user has favorited.
+
+    With the favorites cache enabled this is a set lookup against the
+    user's cached ids; otherwise one query (user_id = ? AND
+    place_id = ANY(?), served by uq_user_place).
+
+    Kept free of search imports, so search can annotate its results
+    without an import cycle.
+
+    Returns:
+        Map of every given place id to its favorite status (all False on error)
+    """
+    statuses = dict.fromkeys(place_ids, False)
+    if not statuses:
+        return statuses
+
+    try:
+        cache = get_favorites_cache()
+        if cache.enabled:
+            favorites = await cache.get(session, user_id)
+            return {place_id: place_id in favorites for place_id in statuses}
+
+        stmt = select(FavoritePlaceModel.place_id).where(
+            FavoritePlaceModel.user_id == user_id,
+            FavoritePlaceModel.place_id == any_(literal(list(statuses), ARRAY(String)))
+        )
+        result = await session.execute(stmt)
+        for place_id in result.scalars():
+            statuses[place_id] = True
+        return statuses
+
+    except Exception as e:
+        logger.error(f"Error checking favorites for user {user_id}, {len(statuses)} places: {e}")
+        return dict.fromkeys(statuses, False)
+
+
+async def get_favorite_ids(session: AsyncSession, user_id: int) -> AbstractSet[str]:
+    """
+    Get all place ids a user has favorited, for marking many results
+    (e.g. a streamed search) without one lookup per result.
+
+    With the favorites cache enabled these are the user's cached ids;
+    otherwise one query on favorite_places.
+
+    Returns:
+        The user's favorite place ids (empty on error)
+    """
+    try:
+        cache = get_favorites_cache()
+        if cache.enabled:
+            return await cache.get(session, user_id)
+
+        stmt = select(FavoritePlaceModel.place_id).where(FavoritePlaceModel.user_id == user_id)
+        result = await session.execute(stmt)
+        return frozenset(result.scalars())
+
+    except Exception as e:
+        logger.error(f"Error loading favorite ids for user {user_id}: {e}")
+        return frozenset()
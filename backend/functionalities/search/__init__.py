@@ -2,6 +2,9 @@ from .controller import router
 from .service import SearchService, get_search_service
 from .adapter import SearchAdapter
 from .models import Place
+from .top_places import TopPlacesCache, top_places_cache, get_top_places_cache
+from .search_counts import SearchCountBuffer, search_count_buffer, get_search_count_buffer
+from .columnar import ColumnarPlaces, index_columns, get_index_columns
 
 __all__ = [
     "router",
@@ -9,4 +12,13 @@ __all__ = [
     "get_search_service",
     "SearchAdapter",
     "Place",
+    "TopPlacesCache",
+    "top_places_cache",
+    "get_top_places_cache",
+    "SearchCountBuffer",
+    "search_count_buffer",
+    "get_search_count_buffer",
+    "ColumnarPlaces",
+    "index_columns",
+    "get_index_columns",
 ]
\ No newline at end of file
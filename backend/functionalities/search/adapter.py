@@ -1,363 +1,358 @@
-from typing import List, Optional
+from contextlib import aclosing
+from typing import AbstractSet, AsyncIterator, Dict, List, Optional, Tuple
 import logging
-from .models import CafeResponse, PriceRange, OpeningHours, PriceDetail
+from .models import CafeResponse
+from .converter import convert_places, to_cafe_response
+from .filters import InvalidFilterError, apply_filters, compile_filters
+from .columnar import apply_masks, compile_masks, get_index_columns
+from .paging import InvalidCursorError, PagedSearch, SearchCursor, request_signature
+from .pushdown import push_down_filters
+from .search_counts import get_search_count_buffer
+from .trending import TRENDING_COLUMNS
 from fastapi import HTTPException
-import httpx
-from config import settings
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import desc, func, select
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import desc, select
 from database.models.search_count import PlaceSearchCountModel
+from database.models.place import PlaceModel
+from places import PlacesClient, PlacesAPIError, create_place_catalog, SEARCH_FIELD_MASK, SEARCH_PAGED_FIELD_MASK, search_field_mask
+from places import Candidates, Location, get_place_index
+from places.index import query_category
+from agent.fast_parser import extract_terms
+from functionalities.favorites.statuses import get_favorite_ids, get_favorite_statuses
+from config import get_place_index_config
 logger = logging.getLogger(__name__)
 
 
+def location_bias(location: Optional[Location]) -> dict:
+    """searchText parameters that bias results towards location (empty for None)."""
+    if location is None:
+        return {}
+    return {
+        "locationBias": {
+            "circle": {
+                "center": {"latitude": location.latitude, "longitude": location.longitude},
+                "radius": location.radius_m
+            }
+        }
+    }
+
+
 class SearchAdapter:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, places_client: PlacesClient):
         self.db: AsyncSession = session
+        self.places_client: PlacesClient = places_client
+        self.catalog = create_place_catalog(session, places_client)
+        self.place_index = get_place_index()
+        self.search_counts = get_search_count_buffer()
     
-    async def search(self, query: str, fields: dict) -> List[CafeResponse]:
+    async def search(self, query: str, fields: dict, location: Optional[Location] = None) -> List[CafeResponse]:
         try:
-            URL = "https://places.googleapis.com/v1/places:searchText"
-
-            HEADERS = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": settings.GOOGLE_API_KEY,
-                "X-Goog-FieldMask": "places.id,places.internationalPhoneNumber,places.formattedAddress,places.rating,places.googleMapsUri,places.businessStatus,places.priceLevel,places.displayName,places.currentOpeningHours,places.primaryType,places.priceRange,places.photos,places.allowsDogs,places.outdoorSeating,places.liveMusic,places.menuForChildren,places.servesCocktails,places.servesDessert,places.servesCoffee,places.goodForChildren,places.restroom,places.goodForGroups,places.goodForWatchingSports,places.paymentOptions,places.accessibilityOptions,places.delivery,places.dineIn,places.reservable,places.servesBreakfast,places.servesLunch,places.servesDinner,places.servesBeer,places.servesWine,places.servesBrunch,places.servesVegetarianFood"
-            }
+            local = self._search_local(query, fields, location)
+            if local is not None:
+                return await self._to_results(local)
 
-            payload = {
-                "textQuery": query
-            }
+            # Fields are known before the fetch, so the API can do part of the filtering
+            # and only the fields needed for the response and the local filters are requested
+            pushed = push_down_filters(fields)
+            places = await self.fetch_candidates(
+                query, pushed.request, search_field_mask(pushed.local_fields), location
+            )
+            return await self.build_results(places, pushed.local_fields)
 
-            with httpx.Client() as client:
-                response = client.post(URL, headers=HEADERS, json=payload)
-                data = response.json()
-                data = data['places']
-
-                filtered_data = self._filter_places(data, fields)
-                
-                cafes = []
-                for place_data in filtered_data:
-                    try:
-                        cafe = self._convert_to_cafe_response(place_data)
-                        cafes.append(cafe)
-                    except Exception as e:
-                        logger.warning(f"Failed to convert place data to CafeResponse: {e}")
-                        continue
-
-
-                place_ids = [cafe.id for cafe in cafes]
-                await self.add_to_place_search_count(place_ids)
-                
-                return cafes
-
-        except HTTPException as e:
+        except (HTTPException, InvalidFilterError):
             raise
         except Exception as e:
             logger.error(f'Error has occurred: {e}')
             return []
 
-    async def add_to_place_search_count(self, place_ids: List[str]) -> bool:
+    async def fetch_candidates(
+        self,
+        query: str,
+        request_filters: Optional[dict] = None,
+        field_mask: str = SEARCH_FIELD_MASK,
+        location: Optional[Location] = None,
+    ) -> List[dict]:
+        """
+        Run the Places text search for query and return the raw place payloads.
+        With the defaults it does not depend on the parsed fields, so it can
+        run alongside the agent.
+
+        Args:
+            request_filters: searchText filter parameters from push_down_filters
+            field_mask: Fields to request; the full mask suits any filter
+            location: Bias results towards this circle
+        """
+        payload = {
+            "textQuery": query,
+            **(request_filters or {}),
+            **location_bias(location)
+        }
+
+        data = await self.places_client.search_text(payload, field_mask)
+        places = data.get('places', [])
+        self.place_index.add(places, field_mask)
+        self.catalog.upsert_later(places)
+        return places
+
+    async def fetch_page(
+        self,
+        query: str,
+        page_size: int,
+        page_token: Optional[str] = None,
+        request_filters: Optional[dict] = None,
+        field_mask: str = SEARCH_PAGED_FIELD_MASK,
+    ) -> dict:
+        """
+        Run one page of the Places text search and return the raw response,
+        including nextPageToken when more results are available.
+
+        Args:
+            request_filters: searchText filter parameters; a page token is only
+                valid with the same parameters as the request that issued it
+            field_mask: Fields to request, including nextPageToken
+
+        Raises:
+            InvalidCursorError: If Google rejects page_token (e.g. it expired)
+            PlacesAPIError: If the request fails otherwise
+        """
+        payload = {
+            "textQuery": query,
+            "pageSize": page_size,
+            **(request_filters or {})
+        }
+        if page_token:
+            payload["pageToken"] = page_token
+
         try:
-            stmt = insert(PlaceSearchCountModel).values([
-                {"place_id": pid, "search_count": 1} for pid in place_ids
-            ])
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["place_id"],
-                set_={
-                    "search_count": PlaceSearchCountModel.search_count + 1,
-                    "last_searched": func.now()
-                }
-            )
-            await self.db.execute(stmt)
-            await self.db.commit()
-            return True
-        except Exception as e:
-            logger.error(f"Error has occurred: {e}")
-            return False
+            data = await self.places_client.search_text(payload, field_mask)
+        except PlacesAPIError as e:
+            if page_token and e.status_code == 400:
+                raise InvalidCursorError(f"Page token rejected: {e}")
+            raise
+        self.place_index.add(data.get('places', []), field_mask)
+        self.catalog.upsert_later(data.get('places', []))
+        return data
 
-    async def get_top_places(self, limit: int = 10):
-        try:    
-            stmt = select(PlaceSearchCountModel.place_id).order_by(desc(PlaceSearchCountModel.search_count)).limit(limit)
-            result = await self.db.execute(stmt)
-            place_ids = result.scalars().all()
-            
-            cafes = []
-            
-            for place_id in place_ids:
+    def paged_search(
+        self,
+        query: str,
+        fields: dict,
+        page_size: int,
+        start: SearchCursor,
+        max_pages: int,
+        first_page: Optional[dict] = None,
+        location: Optional[Location] = None,
+    ) -> PagedSearch:
+        """
+        Set up a lazy walk over the text search pages for query.
+
+        When start.pushed is set, supported criteria are sent to the API
+        with every page request, only the rest are checked locally, and the
+        field mask is reduced to what the response and those checks need.
+
+        Args:
+            first_page: Already fetched response for start's page, if any
+            location: Bias every page towards this circle
+
+        Raises:
+            InvalidFilterError: If fields contains a malformed criterion
+            InvalidCursorError: If start was issued for other request parameters
+                (pushed filters or location), so its page token would not
+                match the request
+        """
+        if start.pushed:
+            request_filters, fields = push_down_filters(fields)
+            field_mask = search_field_mask(fields, paged=True)
+        else:
+            request_filters, field_mask = {}, SEARCH_PAGED_FIELD_MASK
+        request_filters = {**request_filters, **location_bias(location)}
+
+        signature = request_signature(request_filters)
+        if start.filters is not None and start.filters != signature:
+            raise InvalidCursorError("Search parameters changed since the cursor was issued")
+        start = start._replace(filters=signature)
+
+        return PagedSearch(
+            fetch_page=lambda page_token: self.fetch_page(query, page_size, page_token, request_filters, field_mask),
+            predicates=compile_filters(fields),
+            start=start,
+            max_pages=max_pages,
+            first_page=first_page,
+        )
+
+    async def iter_cafes(self, paged: PagedSearch, limit: int) -> AsyncIterator[CafeResponse]:
+        """
+        Yield up to limit cafes from a paged search, each as soon as it has
+        passed the filter and been converted. Pages are only fetched while
+        more cafes are needed.
+        """
+        count = 0
+        async with aclosing(paged.__aiter__()) as matches:
+            async for place_data in matches:
                 try:
-                    URL = f"https://places.googleapis.com/v1/places/{place_id}"
-                    
-                    HEADERS = {
-                        "Content-Type": "application/json",
-                        "X-Goog-Api-Key": settings.GOOGLE_API_KEY,
-                        "X-Goog-FieldMask": "id,displayName,rating,formattedAddress,internationalPhoneNumber,googleMapsUri,businessStatus,primaryType,priceRange,currentOpeningHours,photos,allowsDogs,delivery,reservable,servesBreakfast,servesLunch,servesDinner,servesVegetarianFood"
-                    }
-                    
-                    with httpx.Client() as client:
-                        response = client.get(URL, headers=HEADERS)
-                        if response.status_code == 200:
-                            place_data = response.json()
-                            cafe = self._convert_to_cafe_response(place_data)
-                            cafes.append(cafe)
-                        else:
-                            logger.warning(f"Failed to fetch place {place_id}: {response.status_code}")
-                            
+                    cafe = to_cafe_response(place_data)
                 except Exception as e:
-                    logger.warning(f"Failed to fetch place {place_id}: {e}")
+                    logger.warning(f"Failed to convert place data to CafeResponse: {e}")
+                    continue
+                if cafe is None:
                     continue
-            
-            return cafes
+                yield cafe
+                count += 1
+                if count >= limit:
+                    return
+
+    async def search_paged(self, paged: PagedSearch, limit: int) -> Tuple[List[CafeResponse], Optional[SearchCursor]]:
+        """
+        Collect up to limit matching cafes from a paged search and record
+        their search counts.
+
+        Returns:
+            The cafes and the cursor to resume from (None when exhausted)
+        """
+        cafes = []
+        try:
+            async with aclosing(self.iter_cafes(paged, limit)) as results:
+                async for cafe in results:
+                    cafes.append(cafe)
+        except (HTTPException, InvalidCursorError):
+            raise
         except Exception as e:
             logger.error(f'Error has occurred: {e}')
-            return []
+            # Keep what was collected; the cursor still points past it
+            if not cafes:
+                return [], None
 
-    async def get_places_by_ids(self, place_ids: List[str]):
-        try:
-            URL = "https://places.googleapis.com/v1/places:searchText"
+        if cafes:
+            await self.add_to_place_search_count([cafe.id for cafe in cafes])
 
-            HEADERS = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": settings.GOOGLE_API_KEY,
-                "X-Goog-FieldMask": "places.id,places.internationalPhoneNumber,places.formattedAddress,places.rating,places.googleMapsUri,places.businessStatus,places.priceLevel,places.displayName,places.currentOpeningHours,places.primaryType,places.priceRange,places.photos,places.allowsDogs,places.outdoorSeating,places.liveMusic,places.menuForChildren,places.servesCocktails,places.servesDessert,places.servesCoffee,places.goodForChildren,places.restroom,places.goodForGroups,places.goodForWatchingSports,places.paymentOptions,places.accessibilityOptions,places.delivery,places.dineIn,places.reservable,places.servesBreakfast,places.servesLunch,places.servesDinner,places.servesBeer,places.servesWine,places.servesBrunch,places.servesVegetarianFood"
-            }
+        return cafes, paged.next_cursor
 
-            payload = {
-                "textQuery": query
-            }
+    def _search_local(self, query: str, fields: dict, location: Optional[Location]) -> Optional[List[dict]]:
+        """
+        Try to answer a search from the local place index.
 
-            with httpx.Client() as client:
-                response = client.post(URL, headers=HEADERS, json=payload)
-                data = response.json()
-                data = data['places']
-
-                filtered_data = self._filter_places(data, fields)
-                
-                cafes = []
-                for place_data in filtered_data:
-                    try:
-                        cafe = self._convert_to_cafe_response(place_data)
-                        cafes.append(cafe)
-                    except Exception as e:
-                        logger.warning(f"Failed to convert place data to CafeResponse: {e}")
-                        continue
-
-
-                place_ids = [cafe.id for cafe in cafes]
-                await self.add_to_place_search_count(place_ids)
-                
-                return cafes
-
-        except HTTPException as e:
-            raise
+        Candidates whose name/address match the query's place and area
+        words (and that lie within location, if given) go through the
+        usual filters. They are served only when at least
+        LOCAL_INDEX_MIN_RESULTS pass; otherwise None, and Google is asked.
+
+        Raises:
+            InvalidFilterError: If fields contains a malformed criterion
+        """
+        config = get_place_index_config()
+        candidates = self.place_index.candidates(
+            extract_terms(query),
+            query_category(query),
+            frozenset(fields or ()),
+            location,
+        )
+        if candidates is None:
+            return None
+
+        matches = self._filter_candidates(candidates, fields, config["columnar_min_candidates"])
+        served = len(matches) >= config["min_results"]
+        self.place_index.record(served)
+        if not served:
+            return None
+
+        logger.info(f"SearchAdapter: Served {query!r} from the local index ({len(matches)} matches)")
+        # One text search page worth of results, as from Google
+        return matches[:config["page_size"]]
+
+    def _filter_candidates(self, candidates: Candidates, fields: dict, columnar_min_candidates: int) -> List[dict]:
+        """
+        Filter local index candidates.
+
+        Large pools are filtered with vectorized masks over the index's
+        column store, whose columns persist across searches; small ones
+        go through the per-dict predicates, which are cheaper there.
+
+        Raises:
+            InvalidFilterError: If fields contains a malformed criterion
+        """
+        columns = get_index_columns()
+        if columns is not None and len(candidates.slots) >= columnar_min_candidates:
+            return apply_masks(columns, compile_masks(fields), candidates.slots)
+        return self._filter_places(candidates.places, fields)
+
+    async def build_results(self, places: List[dict], fields: dict) -> List[CafeResponse]:
+        """Filter raw place payloads by fields, convert them and record search counts."""
+        return await self._to_results(self._filter_places(places, fields))
+
+    async def _to_results(self, filtered_data: List[dict]) -> List[CafeResponse]:
+        """Convert filtered place payloads and record search counts."""
+        cafes = convert_places(filtered_data)
+
+        place_ids = [cafe.id for cafe in cafes]
+        await self.add_to_place_search_count(place_ids)
+        
+        return cafes
+
+    async def add_to_place_search_count(self, place_ids: List[str]) -> bool:
+        """
+        Count a search hit for each place. Increments are buffered and
+        written in batches by SearchCountBuffer, so this never waits on the DB.
+        """
+        if not place_ids:
+            return False
+        self.search_counts.add(place_ids)
+        return True
+
+    async def get_favorite_statuses(self, user_id: int, place_ids: List[str]) -> Dict[str, bool]:
+        """Map each place id to whether the user has favorited it, in one query."""
+        return await get_favorite_statuses(self.db, user_id, place_ids)
+
+    async def get_favorite_ids(self, user_id: int) -> AbstractSet[str]:
+        """All place ids the user has favorited, in at most one query."""
+        return await get_favorite_ids(self.db, user_id)
+
+    async def get_top_places(self, limit: int = 10, window: str = "all"):
+        """
+        Get the most searched places.
+
+        Args:
+            window: "all" ranks by all-time search count; "day"/"week" rank by
+                the decayed trending score. Each ordering is served by its own
+                index, so the query reads only limit rows.
+        """
+        try:    
+            if window == "all":
+                order = desc(PlaceSearchCountModel.search_count)
+            else:
+                order = TRENDING_COLUMNS[window].desc().nullslast()
+
+            # One join against the catalog; only missing or stale places go to Google
+            stmt = (
+                select(PlaceSearchCountModel.place_id, PlaceModel.payload, PlaceModel.fetched_at)
+                .outerjoin(PlaceModel, PlaceModel.place_id == PlaceSearchCountModel.place_id)
+                .order_by(order)
+                .limit(limit)
+            )
+            result = await self.db.execute(stmt)
+            rows = [tuple(row) for row in result]
+
+            places = await self.catalog.complete(rows)
+            return convert_places(places)
         except Exception as e:
             logger.error(f'Error has occurred: {e}')
             return []
 
+    async def get_places_by_ids(self, place_ids: List[str]) -> List[CafeResponse]:
+        """
+        Get full cafe details for the given place IDs, from the catalog when
+        fresh and from Google otherwise. Places that fail to load are
+        skipped; order of place_ids is kept.
+        """
+        places = await self.catalog.get_places(place_ids)
+        return convert_places(places)
+
     def _filter_places(self, places: List[dict], fields: dict) -> List[dict]:
         """
         Filter places based on fields criteria.
         Only apply filtering for keys present in fields.
         If a key is not in fields, all values are acceptable.
+
+        Raises:
+            InvalidFilterError: If fields contains a malformed criterion
         """
-        if not fields:
-            return places
-        
-        filtered_places = []
-        
-        for place in places:
-            matches_criteria = True
-            
-            for field_key, field_value in fields.items():
-                if not self._matches_field_criteria(place, field_key, field_value):
-                    matches_criteria = False
-                    break
-            
-            if matches_criteria:
-                filtered_places.append(place)
-        
-        return filtered_places
-    
-    def _matches_field_criteria(self, place: dict, field_key: str, field_value) -> bool:
-        """
-        Check if a place matches the criteria for a specific field.
-        Handles complex fields like rating, currentOpeningHours, priceRange, etc.
-        """
-        if field_key == "rating":
-            place_rating = place.get("rating")
-            if place_rating is None:
-                return False
-            
-            if isinstance(field_value, dict):
-                if "min" in field_value and place_rating < field_value["min"]:
-                    return False
-                if "max" in field_value and place_rating > field_value["max"]:
-                    return False
-                return True
-            else:
-                return place_rating >= field_value
-        
-        elif field_key == "currentOpeningHours":
-            if isinstance(field_value, dict) and "openNow" in field_value:
-                opening_hours = place.get("currentOpeningHours", {})
-                place_open_now = opening_hours.get("openNow", False)
-                return place_open_now == field_value["openNow"]
-            return True
-        
-        elif field_key == "priceRange":
-            if isinstance(field_value, dict):
-                place_price_range = place.get("priceRange", {})
-                
-                place_start_data = place_price_range.get("startPrice", {})
-                place_end_data = place_price_range.get("endPrice", {})
-                
-                if not place_start_data or not place_end_data:
-                    return True
-                
-                try:
-                    place_start_price = float(place_start_data.get("units", 0))
-                    place_end_price = float(place_end_data.get("units", 0))
-                    
-                    user_start_price = None
-                    user_end_price = None
-                    
-                    if "startPrice" in field_value:
-                        user_start_price = float(field_value["startPrice"]["units"])
-                    if "endPrice" in field_value:
-                        user_end_price = float(field_value["endPrice"]["units"])
-                    
-                    
-                    if user_end_price is not None and user_start_price is None:
-                        return place_start_price <= user_end_price
-                    
-                    
-                    elif user_start_price is not None and user_end_price is None:
-                        return place_end_price >= user_start_price
-                    
-                    elif user_start_price is not None and user_end_price is not None:
-                        return place_start_price <= user_end_price and user_start_price <= place_end_price
-                    
-                    return True
-                    
-                except (ValueError, TypeError):
-                    return True
-                
-            return True
-        
-        elif field_key == "paymentOptions":
-            if isinstance(field_value, dict):
-                place_payment_options = place.get("paymentOptions", {})
-                for payment_key, payment_value in field_value.items():
-                    place_payment_value = place_payment_options.get(payment_key)
-                    if place_payment_value != payment_value:
-                        return False
-                return True
-            return True
-        
-        elif field_key == "accessibilityOptions":
-            if isinstance(field_value, dict):
-                place_accessibility = place.get("accessibilityOptions", {})
-                for access_key, access_value in field_value.items():
-                    place_access_value = place_accessibility.get(access_key)
-                    if place_access_value != access_value:
-                        return False
-                return True
-            return True
-        
-        else:
-            place_value = place.get(field_key)
-            
-            if isinstance(field_value, list):
-                return place_value in field_value
-            else:
-                return place_value == field_value
-    
-    def _convert_to_cafe_response(self, place_data: dict) -> CafeResponse:
-        """
-        Convert Google Places API response to CafeResponse model with useful fields
-        """
-        place_id = place_data.get("id")
-        
-        display_name = place_data.get("displayName", {})
-        name = display_name.get("text") 
-        
-        return CafeResponse(
-            id=place_id,
-            name=name,
-            rating=place_data.get("rating"),
-            address=place_data.get("formattedAddress"),
-            phone=place_data.get("internationalPhoneNumber"),
-            google_maps_uri=place_data.get("googleMapsUri"),
-            business_status=place_data.get("businessStatus"),
-            primary_type=place_data.get("primaryType").replace("_", " "),
-            price_range=self._convert_price_range(place_data.get("priceRange")),
-            opening_hours=self._convert_opening_hours(place_data.get("currentOpeningHours")),
-            photos=self._convert_photos(place_data.get("photos")),
-            allows_dogs=place_data.get("allowsDogs"),
-            delivery=place_data.get("delivery"),
-            reservable=place_data.get("reservable"),
-            serves_breakfast=place_data.get("servesBreakfast"),
-            serves_lunch=place_data.get("servesLunch"),
-            serves_dinner=place_data.get("servesDinner"),
-            serves_vegetarian_food=place_data.get("servesVegetarianFood")
-        )
-     
-    def _convert_price_range(self, price_range_data) -> Optional[PriceRange]:
-        """Convert price range data to PriceRange model"""
-        if not price_range_data:
-            return None
-        
-        try:
-            
-            start_price = None
-            end_price = None
-            
-            if "startPrice" in price_range_data:
-                start_data = price_range_data["startPrice"]
-                start_price = PriceDetail(
-                    currencyCode=start_data.get("currencyCode", ""),
-                    units=start_data.get("units", "")
-                )
-            
-            if "endPrice" in price_range_data:
-                end_data = price_range_data["endPrice"]
-                end_price = PriceDetail(
-                    currencyCode=end_data.get("currencyCode", ""),
-                    units=end_data.get("units", "")
-                )
-            
-            return PriceRange(startPrice=start_price, endPrice=end_price)
-        except Exception:
-            return None
-    
-    def _convert_opening_hours(self, opening_hours_data) -> Optional[OpeningHours]:
-        """Convert opening hours data to OpeningHours model"""
-        if not opening_hours_data:
-            return None
-        
-        try:
-            return OpeningHours(
-                openNow=opening_hours_data.get("openNow"),
-                weekdayDescriptions=opening_hours_data.get("weekdayDescriptions"),
-            )
-        except Exception:
-            return None
-    
-    def _convert_photos(self, photos_data) -> Optional[List]:
-        """Convert photos data to Photo models list"""
-        if not photos_data or not isinstance(photos_data, list):
-            return None
-        
-        try:
-            
-            photos = []
-            for photo_data in photos_data:
-                if isinstance(photo_data, dict) and "name" in photo_data:
-                    name = photo_data.get("name")
-                    photo_url = f"https://places.googleapis.com/v1/{name}/media?key={settings.GOOGLE_API_KEY}&maxHeightPx=600&maxWidthPx=600"
-                    photos.append(photo_url)
-            
-            return photos if photos else None
-        except Exception:
-            return None
-   
\ No newline at end of file
+        return apply_filters(places, compile_filters(fields))
@@ -0,0 +1,298 @@
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from places import get_place_index
+from .filters import (
+    Predicate,
+    compile_filter,
+    parse_place_price,
+    parse_price_bounds,
+    parse_rating_bounds,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; callers fall back to the per-dict path
+    np = None
+
+# Known option keys, in bit order. Each key takes two bits in the mask:
+# bit 2*i is set when the option is True, bit 2*i+1 when it is False.
+OPTION_KEYS: Dict[str, Tuple[str, ...]] = {
+    "paymentOptions": ("acceptsCreditCards", "acceptsDebitCards", "acceptsCashOnly", "acceptsNfc"),
+    "accessibilityOptions": (
+        "wheelchairAccessibleParking",
+        "wheelchairAccessibleEntrance",
+        "wheelchairAccessibleSeating",
+        "wheelchairAccessibleRestroom",
+    ),
+}
+
+_TRUE = 1
+_FALSE = 0
+_OTHER = -1
+
+
+def is_available() -> bool:
+    """Whether NumPy is installed and columnar filtering can be used."""
+    return np is not None
+
+
+def _tri_state(value) -> int:
+    """Encode a value compared against True/False with ==, as the dict path does."""
+    if value == True:  # noqa: E712 - match dict-path equality semantics exactly
+        return _TRUE
+    if value == False:  # noqa: E712
+        return _FALSE
+    return _OTHER
+
+
+def _rating(place: dict) -> float:
+    value = place.get("rating")
+    return math.nan if value is None else value
+
+
+def _price_bound(index: int) -> Callable[[dict], float]:
+    def encode(place: dict) -> float:
+        price = parse_place_price(place)
+        return math.nan if price is None else price[index]
+    return encode
+
+
+def _open_now(place: dict) -> int:
+    return _tri_state((place.get("currentOpeningHours") or {}).get("openNow", False))
+
+
+def _flag(field_key: str) -> Callable[[dict], int]:
+    def encode(place: dict) -> int:
+        return _tri_state(place.get(field_key))
+    return encode
+
+
+def _options(field_key: str) -> Callable[[dict], int]:
+    keys = OPTION_KEYS[field_key]
+
+    def encode(place: dict) -> int:
+        place_options = place.get(field_key) or {}
+        bits = 0
+        for bit, key in enumerate(keys):
+            state = _tri_state(place_options.get(key))
+            if state == _TRUE:
+                bits |= 1 << (2 * bit)
+            elif state == _FALSE:
+                bits |= 1 << (2 * bit + 1)
+        return bits
+    return encode
+
+
+class ColumnarPlaces:
+    """
+    Column-oriented store of Places payloads, addressed by slot.
+
+    Used as a SlotStore of the local place index, so every indexed place
+    has a row. A column is built in one pass the first time a filter
+    needs it and is then kept current by set(), so the candidate pools of
+    later searches are filtered with vectorized masks over columns that
+    already exist.
+    """
+
+    def __init__(self, capacity: int):
+        if np is None:
+            raise RuntimeError("NumPy is required for columnar filtering")
+        self.capacity = capacity
+        self.places: List[Optional[dict]] = [None] * capacity
+        # name -> (array, encoder for one place)
+        self._columns: Dict[str, Tuple["np.ndarray", Callable[[dict], object]]] = {}
+        self.filters = 0
+
+    def set(self, slot: int, place: dict) -> None:
+        self.places[slot] = place
+        for array, encode in self._columns.values():
+            array[slot] = encode(place)
+
+    def clear(self, slot: int) -> None:
+        # Column values of a free slot are left as they are; it is never selected
+        self.places[slot] = None
+
+    def _column(self, name: str, encode: Callable[[dict], object], dtype, missing) -> "np.ndarray":
+        column = self._columns.get(name)
+        if column is None:
+            array = np.full(self.capacity, missing, dtype=dtype)
+            for slot, place in enumerate(self.places):
+                if place is not None:
+                    array[slot] = encode(place)
+            column = (array, encode)
+            self._columns[name] = column
+        return column[0]
+
+    def rating(self) -> "np.ndarray":
+        return self._column("rating", _rating, np.float64, math.nan)
+
+    def price(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(start, end); NaN marks places without a usable price range."""
+        return (
+            self._column("priceRange.start", _price_bound(0), np.float64, math.nan),
+            self._column("priceRange.end", _price_bound(1), np.float64, math.nan),
+        )
+
+    def open_now(self) -> "np.ndarray":
+        return self._column("currentOpeningHours.openNow", _open_now, np.int8, _OTHER)
+
+    def flag(self, field_key: str) -> "np.ndarray":
+        """Tri-state column (1 True, 0 False, -1 missing/other) for a boolean amenity."""
+        return self._column(f"flag.{field_key}", _flag(field_key), np.int8, _OTHER)
+
+    def options(self, field_key: str) -> "np.ndarray":
+        """Bitmask column for paymentOptions / accessibilityOptions."""
+        return self._column(f"options.{field_key}", _options(field_key), np.uint16, 0)
+
+    def evaluate(self, predicate: Predicate, slots: "np.ndarray") -> "np.ndarray":
+        """Fallback: evaluate a compiled per-dict predicate for the given slots."""
+        places = self.places
+        return np.fromiter((predicate(places[slot]) for slot in slots), dtype=bool, count=len(slots))
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "columns": len(self._columns),
+            "filters": self.filters,
+        }
+
+
+MaskFn = Callable[[ColumnarPlaces, "np.ndarray"], "np.ndarray"]
+
+
+def _rating_mask(field_value) -> MaskFn:
+    min_rating, max_rating = parse_rating_bounds(field_value)
+
+    def mask(columns: ColumnarPlaces, slots):
+        rating = columns.rating()[slots]
+        result = ~np.isnan(rating)
+        if min_rating is not None:
+            result &= rating >= min_rating
+        if max_rating is not None:
+            result &= rating <= max_rating
+        return result
+
+    return mask
+
+
+def _price_mask(field_value) -> MaskFn:
+    user_start_price, user_end_price = parse_price_bounds(field_value)
+
+    def mask(columns: ColumnarPlaces, slots):
+        start, end = columns.price()
+        start, end = start[slots], end[slots]
+        with np.errstate(invalid="ignore"):
+            if user_start_price is None:
+                matches = start <= user_end_price
+            elif user_end_price is None:
+                matches = end >= user_start_price
+            else:
+                matches = (start <= user_end_price) & (end >= user_start_price)
+        return np.isnan(start) | matches
+
+    return mask
+
+
+def _open_now_mask(open_now: bool) -> MaskFn:
+    expected = _TRUE if open_now else _FALSE
+
+    def mask(columns: ColumnarPlaces, slots):
+        return columns.open_now()[slots] == expected
+
+    return mask
+
+
+def _flag_mask(field_key: str, value: bool) -> MaskFn:
+    expected = _TRUE if value else _FALSE
+
+    def mask(columns: ColumnarPlaces, slots):
+        return columns.flag(field_key)[slots] == expected
+
+    return mask
+
+
+def _options_mask(field_key: str, field_value: dict) -> Optional[MaskFn]:
+    keys = OPTION_KEYS[field_key]
+    required = 0
+    for option_key, option_value in field_value.items():
+        if option_key not in keys:
+            return None
+        bit = keys.index(option_key)
+        required |= 1 << (2 * bit if option_value else 2 * bit + 1)
+
+    def mask(columns: ColumnarPlaces, slots):
+        return (columns.options(field_key)[slots] & required) == required
+
+    return mask
+
+
+def _compile_mask(field_key: str, field_value, predicate: Predicate) -> MaskFn:
+    """Pick a vectorized mask for a criterion; unusual shapes reuse the predicate."""
+    vectorized = None
+    if field_key == "rating":
+        vectorized = _rating_mask(field_value)
+    elif field_key == "priceRange":
+        vectorized = _price_mask(field_value)
+    elif field_key == "currentOpeningHours":
+        vectorized = _open_now_mask(field_value["openNow"])
+    elif field_key in OPTION_KEYS:
+        vectorized = _options_mask(field_key, field_value)
+    elif isinstance(field_value, bool):
+        vectorized = _flag_mask(field_key, field_value)
+
+    if vectorized is not None:
+        return vectorized
+
+    def mask(columns: ColumnarPlaces, slots):
+        return columns.evaluate(predicate, slots)
+
+    return mask
+
+
+def compile_masks(fields: Optional[dict]) -> List[MaskFn]:
+    """
+    Compile the agent's `fields` dict into vectorized mask functions.
+
+    Validation is shared with filters.compile_filters, so malformed
+    criteria raise the same InvalidFilterError.
+    """
+    if not fields:
+        return []
+
+    masks = []
+    for field_key, field_value in fields.items():
+        predicate = compile_filter(field_key, field_value)
+        if predicate is not None:
+            masks.append(_compile_mask(field_key, field_value, predicate))
+    return masks
+
+
+def apply_masks(columns: ColumnarPlaces, masks: List[MaskFn], slots: Sequence[int]) -> List[dict]:
+    """Keep the places in slots that satisfy every mask, in slot order."""
+    columns.filters += 1
+    places = columns.places
+    if not masks:
+        return [places[slot] for slot in slots]
+
+    slots = np.asarray(slots, dtype=np.intp)
+    result = np.ones(len(slots), dtype=bool)
+    for mask in masks:
+        result &= mask(columns, slots)
+    return [places[slot] for slot in slots[result]]
+
+
+def _create_index_columns() -> Optional[ColumnarPlaces]:
+    place_index = get_place_index()
+    if np is None or not place_index.enabled:
+        return None
+    columns = ColumnarPlaces(max(place_index.max_places, 1))
+    place_index.attach(columns)
+    return columns
+
+
+index_columns = _create_index_columns()
+
+
+def get_index_columns() -> Optional[ColumnarPlaces]:
+    """Get the column store kept in step with the local place index (None without NumPy)."""
+    return index_columns
@@ -1,24 +1,61 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
 from .models import SearchResponse, SearchRequest
+from .converter import json_response
 from .service import SearchService, get_search_service
+from .streaming import STREAM_FORMATS, STREAM_HEADERS
+from places import Location
+from config import get_place_index_config, settings
+from utils.auth import get_optional_user_id
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/search", tags=["search"])
 security = HTTPBearer()
 
+
+def _request_location(query: SearchRequest) -> Optional[Location]:
+    """Circle to bias the search towards, if the request has coordinates."""
+    if query.latitude is None or query.longitude is None:
+        return None
+    return Location(
+        query.latitude,
+        query.longitude,
+        query.radius or get_place_index_config()["default_radius"]
+    )
+
 @router.post("", response_model=SearchResponse)
-async def search(query: SearchRequest, search_service: SearchService = Depends(get_search_service)):
+async def search(
+    query: SearchRequest,
+    # Search is public; a valid token only adds is_favorite to the results
+    user_id: Optional[int] = Depends(get_optional_user_id),
+    search_service: SearchService = Depends(get_search_service)
+):
     try:
 
-        cafes = await search_service.search(query.query)
+        if query.paged:
+            response = await search_service.search_paged(
+                query.query,
+                limit=query.limit,
+                page_size=query.pageSize,
+                cursor=query.cursor,
+                location=_request_location(query)
+            )
+            if user_id is not None:
+                response.cafes = await search_service.annotate_favorites(user_id, response.cafes)
+            return json_response(response)
+
+        cafes = await search_service.search(query.query, _request_location(query))
+        if user_id is not None:
+            cafes = await search_service.annotate_favorites(user_id, cafes)
         
-        return SearchResponse(
+        return json_response(SearchResponse(
             cafes=cafes,
             total=len(cafes)
-        )
+        ))
        
     except HTTPException as e:
         raise
@@ -28,16 +65,54 @@ async def search(query: SearchRequest, search_service: SearchService = Depends(g
             detail="Internal server error"
         )
 
-@router.get("/top-places", response_model=SearchResponse)
-async def top_places(search_service: SearchService = Depends(get_search_service)):
+@router.post("/stream")
+async def search_stream(
+    query: SearchRequest,
+    format: Literal["ndjson", "sse"] = Query(default="ndjson"),
+    user_id: Optional[int] = Depends(get_optional_user_id),
+    search_service: SearchService = Depends(get_search_service)
+):
+    """
+    Stream cafes as NDJSON or server-sent events as soon as each one
+    passes the filter, ending with a summary frame (total and timing).
+    Always runs in paging mode; limit, pageSize, cursor and the location apply.
+    With a valid token each cafe carries is_favorite.
+    """
     try:
 
-        cafes = await search_service.get_top_places()
+        frames = await search_service.search_stream(
+            query.query,
+            limit=query.limit,
+            page_size=query.pageSize,
+            cursor=query.cursor,
+            user_id=user_id,
+            location=_request_location(query)
+        )
+        encode, media_type = STREAM_FORMATS[format]
 
-        return SearchResponse(
-            cafes=cafes,
-            total=len(cafes)
+        return StreamingResponse(encode(frames), media_type=media_type, headers=STREAM_HEADERS)
+
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
         )
+
+@router.get("/top-places", response_model=SearchResponse)
+async def top_places(
+    window: Literal["all", "day", "week"] = Query(default="all"),
+    limit: int = Query(default=10, ge=1, le=settings.TOP_PLACES_LIMIT),
+    search_service: SearchService = Depends(get_search_service)
+):
+    """
+    Most searched places. window="all" ranks by all-time searches;
+    "day" and "week" rank by searches decayed with that half-life.
+    """
+    try:
+
+        return json_response(await search_service.get_top_places(limit, window))
        
     except HTTPException as e:
         raise
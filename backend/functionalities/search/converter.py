@@ -0,0 +1,143 @@
+import logging
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+from config import settings
+from .models import CafeResponse
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=1)
+def _photo_url_parts() -> Tuple[str, str]:
+    """Text around the photo name in a photo media URL; the API key never changes at runtime."""
+    return (
+        "https://places.googleapis.com/v1/",
+        f"/media?key={settings.GOOGLE_API_KEY}&maxHeightPx=600&maxWidthPx=600",
+    )
+
+
+def _price_detail(price_data) -> Optional[dict]:
+    if not isinstance(price_data, dict):
+        return None
+    units = price_data.get("units", "")
+    return {
+        "currencyCode": price_data.get("currencyCode", ""),
+        # int64 fields arrive as strings, but the catalog may hold a number
+        "units": units if isinstance(units, str) else str(units),
+    }
+
+
+def _price_range(price_range_data) -> Optional[dict]:
+    if not price_range_data or not isinstance(price_range_data, dict):
+        return None
+    return {
+        "startPrice": _price_detail(price_range_data.get("startPrice")),
+        "endPrice": _price_detail(price_range_data.get("endPrice")),
+    }
+
+
+def _opening_hours(opening_hours_data) -> Optional[dict]:
+    if not opening_hours_data or not isinstance(opening_hours_data, dict):
+        return None
+    return {
+        "openNow": opening_hours_data.get("openNow"),
+        "weekdayDescriptions": opening_hours_data.get("weekdayDescriptions"),
+    }
+
+
+def _photos(photos_data) -> Optional[List[str]]:
+    if not photos_data or not isinstance(photos_data, list):
+        return None
+    prefix, suffix = _photo_url_parts()
+    photos = [
+        prefix + photo["name"] + suffix
+        for photo in photos_data
+        if isinstance(photo, dict) and isinstance(photo.get("name"), str)
+    ]
+    return photos or None
+
+
+def to_cafe_response(place_data: dict) -> Optional[CafeResponse]:
+    """
+    Convert a Google Places payload to a CafeResponse.
+
+    The nested price range and opening hours are built as plain dicts and
+    the whole response is validated in a single model_validate call, so
+    pydantic-core builds every nested model in one pass instead of one
+    Python-level constructor call per model.
+
+    Returns:
+        CafeResponse, or None if the payload has no id or display name
+
+    Raises:
+        ValidationError: If a field has an unexpected type
+    """
+    place_id = place_data.get("id")
+    name = (place_data.get("displayName") or {}).get("text")
+    if not place_id or not name:
+        return None
+
+    primary_type = place_data.get("primaryType")
+    return CafeResponse.model_validate({
+        "id": place_id,
+        "name": name,
+        "rating": place_data.get("rating"),
+        "address": place_data.get("formattedAddress"),
+        "phone": place_data.get("internationalPhoneNumber"),
+        "google_maps_uri": place_data.get("googleMapsUri"),
+        "business_status": place_data.get("businessStatus"),
+        "primary_type": primary_type.replace("_", " ") if primary_type else None,
+        "price_range": _price_range(place_data.get("priceRange")),
+        "opening_hours": _opening_hours(place_data.get("currentOpeningHours")),
+        "photos": _photos(place_data.get("photos")),
+        "allows_dogs": place_data.get("allowsDogs"),
+        "delivery": place_data.get("delivery"),
+        "reservable": place_data.get("reservable"),
+        "serves_breakfast": place_data.get("servesBreakfast"),
+        "serves_lunch": place_data.get("servesLunch"),
+        "serves_dinner": place_data.get("servesDinner"),
+        "serves_vegetarian_food": place_data.get("servesVegetarianFood"),
+    })
+
+
+def convert_places(places: Iterable[Optional[dict]]) -> List[CafeResponse]:
+    """Convert place payloads in order, skipping missing and unconvertible ones."""
+    cafes = []
+    for place_data in places:
+        if not place_data:
+            continue
+        try:
+            cafe = to_cafe_response(place_data)
+        except Exception as e:
+            logger.warning(f"Failed to convert place {place_data.get('id')} to CafeResponse: {e}")
+            continue
+        if cafe is None:
+            logger.warning(f"Skipping place without id or name: {place_data.get('id')}")
+            continue
+        cafes.append(cafe)
+    return cafes
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def json_response(payload: BaseModel, status_code: int = 200) -> Response:
+    """
+    Serialize a response model straight to JSON bytes.
+
+    Returning a model from an endpoint with response_model makes FastAPI
+    dump it to a dict, validate that again and encode it with json.dumps;
+    a Response built here skips all three. The endpoint keeps its
+    response_model for the OpenAPI schema.
+    """
+    return Response(
+        content=_type_adapter(type(payload)).dump_json(payload),
+        status_code=status_code,
+        media_type=JSON_MEDIA_TYPE,
+    )
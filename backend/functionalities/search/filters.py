@@ -0,0 +1,220 @@
+from typing import Callable, List, Optional, Tuple
+
+Predicate = Callable[[dict], bool]
+
+_NESTED_OPTION_FIELDS = ("paymentOptions", "accessibilityOptions")
+
+
+class InvalidFilterError(ValueError):
+    """Raised when a `fields` criterion cannot be compiled into a predicate."""
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def parse_rating_bounds(field_value) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Parse a rating criterion into (min, max).
+    A bare number means a minimum, as in the agent prompt.
+    """
+    if isinstance(field_value, dict):
+        min_rating = field_value.get("min")
+        max_rating = field_value.get("max")
+        for bound in ("min", "max"):
+            if bound in field_value and not _is_number(field_value[bound]):
+                raise InvalidFilterError(f"rating.{bound} must be a number, got {field_value[bound]!r}")
+        return min_rating, max_rating
+
+    if _is_number(field_value):
+        return field_value, None
+
+    raise InvalidFilterError(f"rating must be a number or a min/max object, got {field_value!r}")
+
+
+def parse_price_bounds(field_value: dict) -> Tuple[Optional[float], Optional[float]]:
+    """Parse a priceRange criterion into the user's (start, end) price units."""
+    bounds = []
+    for key in ("startPrice", "endPrice"):
+        if key not in field_value:
+            bounds.append(None)
+            continue
+        price = field_value[key]
+        if not isinstance(price, dict) or "units" not in price:
+            raise InvalidFilterError(f"priceRange.{key} must be an object with units, got {price!r}")
+        try:
+            bounds.append(float(price["units"]))
+        except (ValueError, TypeError):
+            raise InvalidFilterError(f"priceRange.{key}.units must be numeric, got {price['units']!r}")
+    return bounds[0], bounds[1]
+
+
+def parse_place_price(place: dict) -> Optional[Tuple[float, float]]:
+    """
+    Get a place's (start, end) price units, or None when the place has
+    no usable price range (such places always pass the price filter).
+    """
+    place_price_range = place.get("priceRange") or {}
+    place_start_data = place_price_range.get("startPrice")
+    place_end_data = place_price_range.get("endPrice")
+    if not place_start_data or not place_end_data:
+        return None
+    try:
+        return float(place_start_data.get("units", 0)), float(place_end_data.get("units", 0))
+    except (ValueError, TypeError):
+        return None
+
+
+def _compile_rating(field_value) -> Predicate:
+    min_rating, max_rating = parse_rating_bounds(field_value)
+
+    if min_rating is not None and max_rating is not None:
+        def predicate(place: dict) -> bool:
+            rating = place.get("rating")
+            return rating is not None and min_rating <= rating <= max_rating
+    elif min_rating is not None:
+        def predicate(place: dict) -> bool:
+            rating = place.get("rating")
+            return rating is not None and rating >= min_rating
+    elif max_rating is not None:
+        def predicate(place: dict) -> bool:
+            rating = place.get("rating")
+            return rating is not None and rating <= max_rating
+    else:
+        def predicate(place: dict) -> bool:
+            return place.get("rating") is not None
+
+    return predicate
+
+
+def _compile_opening_hours(field_value) -> Optional[Predicate]:
+    if not isinstance(field_value, dict) or "openNow" not in field_value:
+        return None
+
+    open_now = field_value["openNow"]
+    if not isinstance(open_now, bool):
+        raise InvalidFilterError(f"currentOpeningHours.openNow must be a boolean, got {open_now!r}")
+
+    def predicate(place: dict) -> bool:
+        opening_hours = place.get("currentOpeningHours") or {}
+        return opening_hours.get("openNow", False) == open_now
+
+    return predicate
+
+
+def _compile_price_range(field_value) -> Optional[Predicate]:
+    if not isinstance(field_value, dict):
+        return None
+
+    user_start_price, user_end_price = parse_price_bounds(field_value)
+
+    if user_start_price is None and user_end_price is None:
+        return None
+
+    def predicate(place: dict) -> bool:
+        place_price = parse_place_price(place)
+        if place_price is None:
+            return True
+
+        place_start_price, place_end_price = place_price
+        if user_start_price is None:
+            return place_start_price <= user_end_price
+        if user_end_price is None:
+            return place_end_price >= user_start_price
+        return place_start_price <= user_end_price and user_start_price <= place_end_price
+
+    return predicate
+
+
+def _compile_options(field_key: str, field_value) -> Optional[Predicate]:
+    if not isinstance(field_value, dict) or not field_value:
+        return None
+
+    for option_key, option_value in field_value.items():
+        if not isinstance(option_value, bool):
+            raise InvalidFilterError(f"{field_key}.{option_key} must be a boolean, got {option_value!r}")
+
+    required = tuple(field_value.items())
+
+    def predicate(place: dict) -> bool:
+        place_options = place.get(field_key) or {}
+        for option_key, option_value in required:
+            if place_options.get(option_key) != option_value:
+                return False
+        return True
+
+    return predicate
+
+
+def _compile_value(field_key: str, field_value) -> Predicate:
+    if isinstance(field_value, list):
+        try:
+            allowed = frozenset(field_value)
+        except TypeError:
+            allowed = tuple(field_value)
+
+        def predicate(place: dict) -> bool:
+            value = place.get(field_key)
+            try:
+                return value in allowed
+            except TypeError:
+                return False
+    else:
+        def predicate(place: dict) -> bool:
+            return place.get(field_key) == field_value
+
+    return predicate
+
+
+def compile_filter(field_key: str, field_value) -> Optional[Predicate]:
+    """
+    Compile one `fields` criterion into a predicate.
+
+    Returns None for criteria that accept every place.
+
+    Raises:
+        InvalidFilterError: If the criterion is malformed
+    """
+    if field_key == "rating":
+        return _compile_rating(field_value)
+    if field_key == "currentOpeningHours":
+        return _compile_opening_hours(field_value)
+    if field_key == "priceRange":
+        return _compile_price_range(field_value)
+    if field_key in _NESTED_OPTION_FIELDS:
+        return _compile_options(field_key, field_value)
+    return _compile_value(field_key, field_value)
+
+
+def compile_filters(fields: Optional[dict]) -> List[Predicate]:
+    """
+    Compile the agent's `fields` dict into a list of predicates.
+
+    User bounds are parsed and type-checked once here rather than for
+    every place.
+
+    Raises:
+        InvalidFilterError: If any criterion is malformed
+    """
+    if not fields:
+        return []
+    if not isinstance(fields, dict):
+        raise InvalidFilterError(f"fields must be an object, got {fields!r}")
+
+    predicates = []
+    for field_key, field_value in fields.items():
+        predicate = compile_filter(field_key, field_value)
+        if predicate is not None:
+            predicates.append(predicate)
+    return predicates
+
+
+def apply_filters(places: List[dict], predicates: List[Predicate]) -> List[dict]:
+    """Keep the places that satisfy every predicate, in their original order."""
+    if not predicates:
+        return places
+    # One pass per predicate: each pass only sees the survivors of the
+    # previous one, and filter() avoids a Python-level loop per place
+    for predicate in predicates:
+        places = list(filter(predicate, places))
+    return places
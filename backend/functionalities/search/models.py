@@ -1,9 +1,21 @@
 from enum import Enum
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class SearchRequest(BaseModel):
     query: str
+    # Paging mode: setting any of these follows nextPageToken across pages
+    pageSize: Optional[int] = Field(default=None, ge=1, le=20)
+    limit: Optional[int] = Field(default=None, ge=1, le=100)
+    cursor: Optional[str] = None
+    # Optional position; biases the text search and enables nearby local results
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
+    radius: Optional[float] = Field(default=None, gt=0, le=50000)
+
+    @property
+    def paged(self) -> bool:
+        return self.pageSize is not None or self.limit is not None or self.cursor is not None
 
 # Fields with limited values
 class BusinessStatus(str, Enum):
@@ -147,7 +159,17 @@ class CafeResponse(BaseModel):
     serves_lunch: Optional[bool] = None        
     serves_dinner: Optional[bool] = None
     serves_vegetarian_food: Optional[bool] = None       
+    is_favorite: Optional[bool] = None         # only set for authenticated searches
 
 class SearchResponse(BaseModel):
     cafes: List[CafeResponse]
     total: int
+    next_cursor: Optional[str] = None
+
+class SearchSummary(BaseModel):
+    """Final frame of a streamed search."""
+    total: int
+    elapsed_ms: float
+    first_result_ms: Optional[float] = None
+    next_cursor: Optional[str] = None
+    error: Optional[str] = None
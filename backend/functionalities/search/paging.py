@@ -0,0 +1,129 @@
+import base64
+import binascii
+import hashlib
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, NamedTuple, Optional
+from .filters import Predicate, apply_filters
+
+logger = logging.getLogger(__name__)
+
+# Fetches one raw places:searchText response for a page token (None = first page)
+PageFetcher = Callable[[Optional[str]], Awaitable[dict]]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client-supplied search cursor cannot be decoded."""
+
+
+def request_signature(request_filters: dict) -> str:
+    """Short stable hash of the searchText parameters (pushed filters, location bias) a page token was issued for."""
+    raw = json.dumps(request_filters, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+class SearchCursor(NamedTuple):
+    """
+    Position in a paged search: the Places page token to fetch, how many
+    of that page's matches the client has already received, and whether
+    filters were pushed into the request.
+
+    A page token is only valid with the parameters of the request that
+    issued it, so the page size and a signature of the other searchText
+    parameters (pushed filters, location bias) travel with the cursor.
+    """
+    page_token: Optional[str] = None
+    offset: int = 0
+    pushed: bool = False
+    page_size: Optional[int] = None
+    filters: Optional[str] = None
+
+    def encode(self) -> str:
+        raw = json.dumps(
+            {"t": self.page_token, "o": self.offset, "p": int(self.pushed), "s": self.page_size, "f": self.filters},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "SearchCursor":
+        """
+        Decode a cursor produced by encode().
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            data = json.loads(raw)
+            page_token, offset, pushed = data["t"], data["o"], bool(data.get("p", 0))
+            page_size, filters = data.get("s"), data.get("f")
+        except (binascii.Error, ValueError, TypeError, KeyError, AttributeError) as e:
+            raise InvalidCursorError(f"Malformed search cursor: {e}")
+
+        if page_token is not None and not isinstance(page_token, str):
+            raise InvalidCursorError("Search cursor page token must be a string")
+        if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+            raise InvalidCursorError("Search cursor offset must be a non-negative integer")
+        if page_size is not None and (not isinstance(page_size, int) or isinstance(page_size, bool) or page_size <= 0):
+            raise InvalidCursorError("Search cursor page size must be a positive integer")
+        if filters is not None and not isinstance(filters, str):
+            raise InvalidCursorError("Search cursor filter signature must be a string")
+        return cls(page_token, offset, pushed, page_size, filters)
+
+
+class PagedSearch:
+    """
+    Lazily walks Places text search pages, filtering each page as it arrives.
+
+    Iterating yields matching place payloads one at a time; the next page
+    is only requested once the consumer asks for more matches than the
+    pages fetched so far contain, and never beyond max_pages. After
+    iteration stops (for any reason), next_cursor points just past the
+    last match handed out, or is None when the results are exhausted.
+    """
+
+    def __init__(
+        self,
+        fetch_page: PageFetcher,
+        predicates: List[Predicate],
+        start: SearchCursor,
+        max_pages: int,
+        first_page: Optional[dict] = None,
+    ):
+        self.fetch_page = fetch_page
+        self.predicates = predicates
+        self.start = start
+        self.max_pages = max_pages
+        self.first_page = first_page
+        self.pages_fetched = 0
+        self.next_cursor: Optional[SearchCursor] = start
+
+    async def __aiter__(self) -> AsyncIterator[dict]:
+        page_token, offset = self.start.page_token, self.start.offset
+        data = self.first_page
+
+        while self.pages_fetched < self.max_pages:
+            if data is None:
+                data = await self.fetch_page(page_token)
+            self.pages_fetched += 1
+
+            matches = apply_filters(data.get("places", []), self.predicates)
+            next_token = data.get("nextPageToken")
+            data = None
+
+            # Where to resume once this page's matches are used up
+            after_page = self.start._replace(page_token=next_token, offset=0) if next_token else None
+            if offset >= len(matches):
+                self.next_cursor = after_page
+
+            for index in range(offset, len(matches)):
+                last = index + 1 == len(matches)
+                self.next_cursor = after_page if last else self.start._replace(page_token=page_token, offset=index + 1)
+                yield matches[index]
+
+            if next_token is None:
+                return
+            page_token, offset = next_token, 0
+
+        logger.info(f"PagedSearch: Page budget of {self.max_pages} reached")
@@ -0,0 +1,96 @@
+import math
+from typing import NamedTuple, Optional
+from .filters import InvalidFilterError, parse_rating_bounds
+from .models import PriceLevel
+
+# priceLevels accepted by places:searchText; PRICE_LEVEL_FREE is rejected by the API
+_PUSHABLE_PRICE_LEVELS = frozenset(level.value for level in PriceLevel) - {PriceLevel.PRICE_LEVEL_FREE.value}
+
+# minRating must be on a 0.5 cadence; the API rounds other values up
+_RATING_STEP = 0.5
+
+
+class PushDown(NamedTuple):
+    """
+    A `fields` dict split into searchText request parameters and the
+    criteria that still have to be applied locally.
+    """
+    request: dict
+    local_fields: dict
+
+
+def _push_rating(field_value, request: dict, local_fields: dict) -> None:
+    min_rating, max_rating = parse_rating_bounds(field_value)
+    if min_rating is None or not 0 <= min_rating <= 5:
+        local_fields["rating"] = field_value
+        return
+
+    # Floor to the cadence so the API never drops a place the user asked for
+    floor = math.floor(min_rating / _RATING_STEP) * _RATING_STEP
+    if floor > 0:
+        request["minRating"] = floor
+
+    if floor != min_rating:
+        local_fields["rating"] = field_value
+    elif max_rating is not None:
+        local_fields["rating"] = {"max": max_rating}
+
+
+def _push_opening_hours(field_value, request: dict, local_fields: dict) -> None:
+    # The API can only restrict to open places; "closed now" stays local
+    if isinstance(field_value, dict) and field_value.get("openNow") is True and len(field_value) == 1:
+        request["openNow"] = True
+    else:
+        local_fields["currentOpeningHours"] = field_value
+
+
+def _push_price_level(field_value, request: dict, local_fields: dict) -> None:
+    levels = [field_value] if isinstance(field_value, str) else field_value
+    if isinstance(levels, list) and levels and all(
+        isinstance(level, str) and level in _PUSHABLE_PRICE_LEVELS for level in levels
+    ):
+        request["priceLevels"] = list(dict.fromkeys(levels))
+    else:
+        local_fields["priceLevel"] = field_value
+
+
+def _push_primary_type(field_value, request: dict, local_fields: dict) -> None:
+    # includedType matches any of a place's types, not just the primary one,
+    # so it only narrows the request; the exact check stays local
+    if isinstance(field_value, str) and field_value:
+        request["includedType"] = field_value
+    local_fields["primaryType"] = field_value
+
+
+_PUSHERS = {
+    "rating": _push_rating,
+    "currentOpeningHours": _push_opening_hours,
+    "priceLevel": _push_price_level,
+    "primaryType": _push_primary_type,
+}
+
+
+def push_down_filters(fields: Optional[dict]) -> PushDown:
+    """
+    Move every criterion places:searchText supports natively
+    (minRating, openNow, priceLevels, includedType) into request
+    parameters. Criteria the API can only approximate stay in
+    local_fields as well, so results are the same as filtering locally.
+
+    Raises:
+        InvalidFilterError: If a pushed criterion is malformed
+    """
+    if not fields:
+        return PushDown({}, {})
+    if not isinstance(fields, dict):
+        raise InvalidFilterError(f"fields must be an object, got {fields!r}")
+
+    request: dict = {}
+    local_fields: dict = {}
+    for field_key, field_value in fields.items():
+        pusher = _PUSHERS.get(field_key)
+        if pusher is None:
+            local_fields[field_key] = field_value
+        else:
+            pusher(field_value, request, local_fields)
+    return PushDown(request, local_fields)
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Iterable, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from config import get_search_count_config
+from database.config import get_async_db_context_manager
+from database.models.search_count import PlaceSearchCountModel
+from utils.jobs import get_job_queue
+from .trending import TRENDING_COLUMNS, logaddexp_sql, score_increment
+
+logger = logging.getLogger(__name__)
+
+# Four bind parameters per row; stays well below asyncpg's 32767 limit
+_MAX_ROWS_PER_STATEMENT = 5000
+
+
+class SearchCountBuffer:
+    """
+    Coalescing buffer for place_search_counts increments.
+
+    Searches only bump in-memory counters; every SEARCH_COUNT_FLUSH_INTERVAL
+    seconds (or sooner once SEARCH_COUNT_MAX_PENDING places are waiting)
+    a flush job is put on the background job queue, which writes the
+    summed deltas in one multi-row upsert, so hot places are updated once
+    per flush instead of once per search. The same upsert folds the
+    deltas into the decayed trending scores. stop() flushes whatever is
+    left.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Counter = Counter()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        # A flush job is queued or running; don't queue another behind it
+        self._flush_queued = False
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failures = 0
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("SearchCountBuffer: Background flush started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+        logger.info("SearchCountBuffer: Background flush stopped")
+
+    def add(self, place_ids: Iterable[str]) -> None:
+        """Count one search hit for each place id."""
+        self._pending.update(place_ids)
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self, raise_errors: bool = False) -> int:
+        """
+        Write all pending increments.
+
+        Args:
+            raise_errors: Re-raise a failed write (after keeping the deltas), so a
+                job queue can retry it
+
+        Returns:
+            Number of places written; on failure the deltas are kept for the next flush
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            deltas, self._pending = self._pending, Counter()
+            # Sorted so concurrent writers lock rows in the same order
+            now = time.time()
+            rows = [
+                {
+                    "place_id": place_id,
+                    "search_count": count,
+                    **{column.key: score_increment(window, count, now) for window, column in TRENDING_COLUMNS.items()}
+                }
+                for place_id, count in sorted(deltas.items())
+            ]
+
+            try:
+                async with get_async_db_context_manager() as session:
+                    for start in range(0, len(rows), _MAX_ROWS_PER_STATEMENT):
+                        stmt = insert(PlaceSearchCountModel).values(rows[start:start + _MAX_ROWS_PER_STATEMENT])
+                        set_ = {
+                            "search_count": PlaceSearchCountModel.search_count + stmt.excluded.search_count,
+                            "last_searched": func.now()
+                        }
+                        for column in TRENDING_COLUMNS.values():
+                            set_[column.key] = logaddexp_sql(column, getattr(stmt.excluded, column.key))
+                        stmt = stmt.on_conflict_do_update(index_elements=["place_id"], set_=set_)
+                        await session.execute(stmt)
+                    await session.commit()
+            except Exception as e:
+                self.failures += 1
+                self._pending.update(deltas)
+                logger.error(f"SearchCountBuffer: Failed to flush {len(rows)} places: {e}")
+                if raise_errors:
+                    raise
+                return 0
+
+            self.flushes += 1
+            self.flushed_rows += len(rows)
+            return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            if not self._pending or self._flush_queued:
+                continue
+            self._flush_queued = True
+            # A rejected job leaves the deltas pending for the next interval
+            if not get_job_queue().submit("search_count_flush", self._flush_job):
+                self._flush_queued = False
+
+    async def _flush_job(self) -> None:
+        try:
+            await self.flush(raise_errors=True)
+        finally:
+            self._flush_queued = False
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "flush_queued": self._flush_queued,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failures": self.failures,
+        }
+
+
+def _create_search_count_buffer() -> SearchCountBuffer:
+    config = get_search_count_config()
+    return SearchCountBuffer(flush_interval=config["flush_interval"], max_pending=config["max_pending"])
+
+
+search_count_buffer = _create_search_count_buffer()
+
+
+def get_search_count_buffer() -> SearchCountBuffer:
+    """Get the application-wide search count buffer."""
+    return search_count_buffer
@@ -1,34 +1,76 @@
+import asyncio
 import logging
-from .adapter import SearchAdapter
+import time
+from contextlib import aclosing
+from .adapter import SearchAdapter, location_bias
 from fastapi import HTTPException, status
-from .models import CafeResponse
-from typing import List
-from agent.agent import Agent
+from .models import CafeResponse, SearchResponse, SearchSummary
+from .filters import InvalidFilterError, compile_filters
+from .paging import InvalidCursorError, PagedSearch, SearchCursor
+from .top_places import TopPlacesCache, get_top_places_cache
+from typing import AsyncIterator, Awaitable, List, Optional, Tuple, TypeVar, Union
+from agent.agent import get_agent
+from agent.cache import QueryFieldsCache, get_query_fields_cache
+from agent.fast_parser import FastQueryParser, get_fast_query_parser
 from database.config import get_async_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
+from places import Location, get_places_client
+from config import get_search_paging_config, get_search_pipeline_config
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# One streamed search event: ("cafe", CafeResponse) or ("summary", SearchSummary)
+SearchFrame = Tuple[str, Union[CafeResponse, SearchSummary]]
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+def _retrieving_task(awaitable: Awaitable[T]) -> "asyncio.Future[T]":
+    """Run awaitable as a task whose exception is marked retrieved even if nobody awaits it."""
+    task = asyncio.ensure_future(awaitable)
+    task.add_done_callback(_retrieve_exception)
+    return task
+
+
 class SearchService:
-    def __init__(self, search_adapter: SearchAdapter):
+    def __init__(
+        self,
+        search_adapter: SearchAdapter,
+        top_places_cache: TopPlacesCache,
+        query_cache: QueryFieldsCache,
+        fast_parser: FastQueryParser,
+    ):
         self.search_adapter = search_adapter
+        self.top_places_cache = top_places_cache
+        self.query_cache = query_cache
+        self.fast_parser = fast_parser
 
-    async def search(self, query: str) -> List[CafeResponse]:
+    async def search(self, query: str, location: Optional[Location] = None) -> List[CafeResponse]:
         
         try:
-            agent = Agent()
-            response = agent.generate_response(query)
-            if response is None:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Bir hata oluştu"
-                )
-            fields = response['fields']
-                
             logger.info(f"SearchService: Search attempt for query: {query}")
-            
-            return await self.search_adapter.search(query, fields)
+
+            fields = self._parse_locally(query)
+            if fields is not None:
+                cafes = await self.search_adapter.search(query, fields, location)
+            else:
+                cafes = await self._search_with_agent(query, location)
+
+            self.top_places_cache.record_changes(len(cafes))
+
+            return cafes
+        except InvalidFilterError as e:
+            logger.warning(f"SearchService: Invalid search criteria for query {query}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Geçersiz arama kriterleri"
+            )
         except HTTPException:
             raise
         except Exception as e:
@@ -38,14 +80,337 @@ class SearchService:
                 detail="Sunucu hatası"
             )
 
-    async def get_top_places(self, limit: int = 10):
+    async def search_paged(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        location: Optional[Location] = None,
+    ) -> SearchResponse:
+        """
+        Search in paging mode: follow nextPageToken until limit matches are
+        collected or the page budget is used up.
+
+        Args:
+            limit: Maximum number of cafes to return
+            page_size: Places text search page size
+            cursor: next_cursor from a previous response, to continue from there
+            location: Bias every page towards this circle; a cursor only
+                continues with the location it was issued for
+
+        Returns:
+            SearchResponse whose next_cursor is set when more results may exist
+        """
+        limit = limit or get_search_paging_config()["default_limit"]
+
+        try:
+            logger.info(f"SearchService: Paged search attempt for query: {query}")
+
+            paged = await self._prepare_paged(query, page_size, cursor, location)
+            if paged is None:
+                return SearchResponse(cafes=[], total=0)
+
+            cafes, next_cursor = await self.search_adapter.search_paged(paged, limit)
+
+            self.top_places_cache.record_changes(len(cafes))
+
+            return SearchResponse(
+                cafes=cafes,
+                total=len(cafes),
+                next_cursor=next_cursor.encode() if next_cursor else None
+            )
+        except InvalidCursorError as e:
+            logger.warning(f"SearchService: Invalid cursor for query {query}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Geçersiz sayfa imleci"
+            )
+        except InvalidFilterError as e:
+            logger.warning(f"SearchService: Invalid search criteria for query {query}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Geçersiz arama kriterleri"
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"SearchService: Unexpected error during paged search for {query}: {str(e)}", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Sunucu hatası"
+            )
+
+    async def search_stream(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        user_id: Optional[int] = None,
+        location: Optional[Location] = None,
+    ) -> AsyncIterator[SearchFrame]:
+        """
+        Streaming variant of search_paged.
+
+        Parsing and validation happen before this returns, so bad requests
+        still fail with a proper status code. The returned iterator then
+        yields ("cafe", CafeResponse) frames as soon as each cafe passes the
+        filter, followed by a single ("summary", SearchSummary) frame.
+
+        Args:
+            user_id: Authenticated user; each cafe frame then carries is_favorite
+            location: Bias every page towards this circle
+        """
+        started = time.perf_counter()
+        limit = limit or get_search_paging_config()["default_limit"]
+
+        try:
+            logger.info(f"SearchService: Streaming search attempt for query: {query}")
+            paged = await self._prepare_paged(query, page_size, cursor, location)
+        except InvalidCursorError as e:
+            logger.warning(f"SearchService: Invalid cursor for query {query}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Geçersiz sayfa imleci"
+            )
+        except InvalidFilterError as e:
+            logger.warning(f"SearchService: Invalid search criteria for query {query}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Geçersiz arama kriterleri"
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"SearchService: Unexpected error during streaming search for {query}: {str(e)}", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Sunucu hatası"
+            )
+
+        return self._stream_frames(query, paged, limit, started, user_id)
+
+    async def _stream_frames(
+        self,
+        query: str,
+        paged: Optional[PagedSearch],
+        limit: int,
+        started: float,
+        user_id: Optional[int] = None,
+    ) -> AsyncIterator[SearchFrame]:
+        place_ids = []
+        first_result_ms = None
+        error = None
+
+        try:
+            if paged is not None:
+                try:
+                    # Loaded once, so each streamed cafe is marked with a set lookup
+                    favorites = await self.search_adapter.get_favorite_ids(user_id) if user_id is not None else None
+                    async with aclosing(self.search_adapter.iter_cafes(paged, limit)) as results:
+                        async for cafe in results:
+                            if first_result_ms is None:
+                                first_result_ms = (time.perf_counter() - started) * 1000
+                            if favorites is not None:
+                                cafe = cafe.model_copy(update={"is_favorite": cafe.id in favorites})
+                            place_ids.append(cafe.id)
+                            yield "cafe", cafe
+                except InvalidCursorError as e:
+                    # Headers are already sent; report the failure in the summary instead
+                    logger.warning(f"SearchService: Invalid cursor for query {query}: {e}")
+                    error = "Geçersiz sayfa imleci"
+                except Exception as e:
+                    # Headers are already sent; report the failure in the summary instead
+                    logger.error(f"SearchService: Error while streaming results for {query}: {str(e)}", exc_info=True)
+                    error = "Sunucu hatası"
+
+            next_cursor = paged.next_cursor if paged is not None and error is None else None
+            yield "summary", SearchSummary(
+                total=len(place_ids),
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+                first_result_ms=round(first_result_ms, 1) if first_result_ms is not None else None,
+                next_cursor=next_cursor.encode() if next_cursor else None,
+                error=error
+            )
+        finally:
+            # Cafes already sent were seen even if the client disconnected mid-stream
+            if place_ids:
+                await self.search_adapter.add_to_place_search_count(place_ids)
+                self.top_places_cache.record_changes(len(place_ids))
+
+    async def _prepare_paged(
+        self,
+        query: str,
+        page_size: Optional[int],
+        cursor: Optional[str],
+        location: Optional[Location] = None,
+    ) -> Optional[PagedSearch]:
+        """
+        Decode the cursor, get the fields and set up the paged search.
+
+        When the fields are known before the first fetch, supported filters
+        are pushed into the Places request. Otherwise the first page is
+        fetched during the LLM parse and filtering stays local. Returns
+        None if that fetch failed, meaning there are no results to show.
+
+        Raises:
+            InvalidCursorError: If cursor is malformed, was issued for other
+                pushed filters or another location, or its page token is rejected
+            InvalidFilterError: If the parsed fields are malformed
+        """
+        config = get_search_paging_config()
+        start = SearchCursor.decode(cursor) if cursor else SearchCursor()
+        # The cursor's page token only works with the page size it was issued for
+        page_size = start.page_size or page_size or config["page_size"]
+        start = start._replace(page_size=page_size)
+
+        first_page = None
+        fields = self._parse_locally(query)
+        if cursor is None:
+            start = start._replace(pushed=fields is not None)
+
+        if fields is None and start.pushed:
+            # A pushed-down page token is only valid with the same filters, so parse first
+            fields = await self._parse_with_timeout(query)
+        elif fields is None:
+            # The first page does not depend on the fields, so fetch it during the parse
+            fields, first_page = await self._parse_alongside(
+                query,
+                self.search_adapter.fetch_page(
+                    query, page_size, start.page_token, request_filters=location_bias(location)
+                )
+            )
+            if first_page is None:
+                return None
+
+        return self.search_adapter.paged_search(
+            query, fields, page_size, start, config["max_pages"], first_page, location
+        )
+
+    async def _parse_with_timeout(self, query: str) -> dict:
+        """Parse query with the LLM on its own, under the pipeline parse timeout."""
         try:
-            return await self.search_adapter.get_top_places(limit)
+            return await asyncio.wait_for(
+                self._parse_with_agent(query), timeout=get_search_pipeline_config()["parse_timeout"]
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"SearchService: Query parsing timed out for query: {query}")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="İstek zaman aşımına uğradı"
+            )
+
+    async def _search_with_agent(self, query: str, location: Optional[Location] = None) -> List[CafeResponse]:
+        """Parse query with the LLM while the first text search page is fetched."""
+        fields, places = await self._parse_alongside(
+            query, self.search_adapter.fetch_candidates(query, location=location)
+        )
+        if places is None:
+            return []
+
+        return await self.search_adapter.build_results(places, fields)
+
+    async def _parse_alongside(self, query: str, fetch: Awaitable[T]) -> Tuple[dict, Optional[T]]:
+        """
+        Run the LLM parse and a Places text search concurrently.
+
+        The text search does not depend on the parsed fields, so latency is
+        the slower of the two stages instead of their sum. Each stage has
+        its own timeout; a failed parse cancels the text search, while a
+        failed text search yields None so the caller can return no results.
+
+        Returns:
+            The parsed fields and the fetch result (None if the fetch failed)
+        """
+        config = get_search_pipeline_config()
+
+        parse_task = asyncio.create_task(
+            asyncio.wait_for(self._parse_with_agent(query), timeout=config["parse_timeout"])
+        )
+        # wait_for would wrap a bare coroutine in a task nobody can reach; if the
+        # parse fails and the fetch ends with an error while being cancelled,
+        # asyncio would log it as never retrieved
+        fetch_task = asyncio.create_task(
+            asyncio.wait_for(_retrieving_task(fetch), timeout=config["fetch_timeout"])
+        )
+
+        try:
+            fields = await parse_task
+        except asyncio.TimeoutError:
+            fetch_task.cancel()
+            logger.error(f"SearchService: Query parsing timed out for query: {query}")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="İstek zaman aşımına uğradı"
+            )
+        except BaseException:
+            # Also covers the request itself being cancelled
+            fetch_task.cancel()
+            raise
+
+        try:
+            return fields, await fetch_task
+        except InvalidCursorError:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"SearchService: Places text search timed out for query: {query}")
+        except Exception as e:
+            logger.error(f'Error has occurred: {e}')
+        return fields, None
+
+    def _parse_locally(self, query: str) -> Optional[dict]:
+        """
+        Get fields without calling the LLM: the fast parser first, then
+        the query cache. Returns None when the LLM is needed.
+        """
+        response = self.fast_parser.parse(query)
+        if response is not None:
+            return response['fields']
+
+        return self.query_cache.get(query)
+
+    async def _parse_with_agent(self, query: str) -> dict:
+        """Parse query with the LLM agent and cache the result."""
+        response = await get_agent().generate_response(query)
+        if response is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Bir hata oluştu"
+            )
+        fields = response['fields']
+        # Reject malformed criteria before they are cached or the text search is awaited
+        compile_filters(fields)
+        self.query_cache.set(query, fields)
+
+        return fields
+
+    async def annotate_favorites(self, user_id: int, cafes: List[CafeResponse]) -> List[CafeResponse]:
+        """
+        Set is_favorite on search results for an authenticated user.
+
+        Results may be shared (e.g. the top places snapshot), so annotated
+        copies are returned.
+        """
+        if not cafes:
+            return cafes
+
+        statuses = await self.search_adapter.get_favorite_statuses(user_id, [cafe.id for cafe in cafes])
+        return [cafe.model_copy(update={"is_favorite": statuses.get(cafe.id, False)}) for cafe in cafes]
+
+    async def get_top_places(self, limit: int = 10, window: str = "all") -> SearchResponse:
+        try:
+            response = await self.top_places_cache.get(window)
+            if limit >= response.total:
+                return response
+
+            cafes = response.cafes[:limit]
+            return SearchResponse(cafes=cafes, total=len(cafes))
         except Exception:
             raise
 
 def get_search_service(db: AsyncSession = Depends(get_async_db)) -> SearchService:
-    search_adapter = SearchAdapter(db)
-    return SearchService(search_adapter)
+    search_adapter = SearchAdapter(db, get_places_client())
+    return SearchService(search_adapter, get_top_places_cache(), get_query_fields_cache(), get_fast_query_parser())
 
 
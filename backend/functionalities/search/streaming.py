@@ -0,0 +1,26 @@
+from typing import AsyncIterator, Tuple
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Keep proxies (e.g. nginx) from buffering the stream
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+async def encode_ndjson(frames: AsyncIterator[Tuple[str, BaseModel]]) -> AsyncIterator[bytes]:
+    """One JSON object per line: {"type": <event>, "data": <payload>}."""
+    async for event, payload in frames:
+        yield f'{{"type":"{event}","data":{payload.model_dump_json()}}}\n'.encode()
+
+
+async def encode_sse(frames: AsyncIterator[Tuple[str, BaseModel]]) -> AsyncIterator[bytes]:
+    """Server-sent events, one event per frame with the payload as JSON data."""
+    async for event, payload in frames:
+        yield f"event: {event}\ndata: {payload.model_dump_json()}\n\n".encode()
+
+
+STREAM_FORMATS = {
+    "ndjson": (encode_ndjson, NDJSON_MEDIA_TYPE),
+    "sse": (encode_sse, SSE_MEDIA_TYPE),
+}
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from config import get_top_places_config
+from database.config import get_async_db_context_manager
+from places import get_places_client
+from .adapter import SearchAdapter
+from .models import SearchResponse
+from .trending import TOP_PLACES_WINDOWS
+
+logger = logging.getLogger(__name__)
+
+
+class TopPlacesCache:
+    """
+    Precomputed /search/top-places responses, one per ranking window
+    ("all", "day", "week").
+
+    A background task rebuilds the ranked SearchResponses every
+    TOP_PLACES_REFRESH_INTERVAL seconds, or sooner once
+    TOP_PLACES_CHANGE_THRESHOLD search counts have been recorded.
+    Readers always get the last snapshot and never wait on Google,
+    except on a cold start before the first snapshot exists.
+    """
+
+    def __init__(self, limit: int, refresh_interval: float, change_threshold: int, cold_wait: float):
+        self.limit = limit
+        self.refresh_interval = refresh_interval
+        self.change_threshold = change_threshold
+        self.cold_wait = cold_wait
+        self._snapshots: Dict[str, SearchResponse] = {}
+        self._ready = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._changes = 0
+        self._task: Optional[asyncio.Task] = None
+        self.refreshed_at: Optional[float] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("TopPlacesCache: Background refresh started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("TopPlacesCache: Background refresh stopped")
+
+    def record_changes(self, count: int) -> None:
+        """Note new search counts; triggers an early refresh past the threshold."""
+        self._changes += count
+        if self._changes >= self.change_threshold:
+            self._wakeup.set()
+
+    async def get(self, window: str = "all") -> SearchResponse:
+        """Get the current snapshot for window, waiting briefly only if none exists yet."""
+        if not self._ready.is_set():
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=self.cold_wait)
+            except asyncio.TimeoutError:
+                logger.warning("TopPlacesCache: No snapshot yet, serving empty response")
+
+        return self._snapshots.get(window) or SearchResponse(cafes=[], total=0)
+
+    async def refresh(self) -> None:
+        """Recompute every window's snapshot. Previous ones are served until this finishes."""
+        started = time.monotonic()
+        self._changes = 0
+
+        async with get_async_db_context_manager() as session:
+            search_adapter = SearchAdapter(session, get_places_client())
+            for window in TOP_PLACES_WINDOWS:
+                cafes = await search_adapter.get_top_places(self.limit, window)
+
+                if not cafes and window in self._snapshots:
+                    logger.warning(f"TopPlacesCache: Refresh returned no {window} places, keeping previous snapshot")
+                    continue
+                self._snapshots[window] = SearchResponse(cafes=cafes, total=len(cafes))
+
+        self.refreshed_at = time.time()
+        self._ready.set()
+        logger.info(f"TopPlacesCache: Refreshed {len(TOP_PLACES_WINDOWS)} windows in {time.monotonic() - started:.2f}s")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"TopPlacesCache: Refresh failed: {e}", exc_info=True)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+def _create_top_places_cache() -> TopPlacesCache:
+    config = get_top_places_config()
+    return TopPlacesCache(
+        limit=config["limit"],
+        refresh_interval=config["refresh_interval"],
+        change_threshold=config["change_threshold"],
+        cold_wait=config["cold_wait"],
+    )
+
+
+top_places_cache = _create_top_places_cache()
+
+
+def get_top_places_cache() -> TopPlacesCache:
+    """Get the application-wide top places cache."""
+    return top_places_cache
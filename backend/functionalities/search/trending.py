@@ -0,0 +1,60 @@
+import math
+import time
+from typing import Dict, Optional
+from sqlalchemy import case, func
+from sqlalchemy.sql.elements import ColumnElement
+from config import get_trending_config
+from database.models.search_count import PlaceSearchCountModel
+
+# Scores are log(sum(count_i * exp(rate * t_i))) with t in seconds since
+# this epoch. Adding rate * t instead of decaying old scores means a row
+# only changes when its place is searched, while ORDER BY score still
+# ranks by the decayed count at any moment (every row shares the same
+# exp(-rate * now) factor).
+_EPOCH = 1704067200.0  # 2024-01-01T00:00:00Z
+
+# Beyond this gap the smaller term adds less than e^-30; also keeps exp() from underflowing in Postgres
+_LOGADDEXP_CUTOFF = 30.0
+
+# Window -> decayed score column; "all" ranks by the all-time search_count
+TRENDING_COLUMNS = {
+    "day": PlaceSearchCountModel.trend_day,
+    "week": PlaceSearchCountModel.trend_week,
+}
+
+TOP_PLACES_WINDOWS = ("all", *TRENDING_COLUMNS)
+
+
+def _decay_rates() -> Dict[str, float]:
+    config = get_trending_config()
+    return {
+        window: math.log(2) / (config[f"{window}_half_life_hours"] * 3600.0)
+        for window in TRENDING_COLUMNS
+    }
+
+
+DECAY_RATES = _decay_rates()
+
+
+def score_increment(window: str, count: int, now: Optional[float] = None) -> float:
+    """Log-domain score of count searches happening at now (unix time)."""
+    now = time.time() if now is None else now
+    return math.log(count) + DECAY_RATES[window] * (now - _EPOCH)
+
+
+def decayed_count(window: str, score: Optional[float], now: Optional[float] = None) -> float:
+    """Turn a stored score back into the decayed search count at now."""
+    if score is None:
+        return 0.0
+    now = time.time() if now is None else now
+    return math.exp(score - DECAY_RATES[window] * (now - _EPOCH))
+
+
+def logaddexp_sql(current: ColumnElement, increment: ColumnElement) -> ColumnElement:
+    """SQL for log(exp(current) + exp(increment)), treating a NULL current as empty."""
+    gap = func.abs(current - increment)
+    return case(
+        (current.is_(None), increment),
+        (gap > _LOGADDEXP_CUTOFF, func.greatest(current, increment)),
+        else_=func.greatest(current, increment) + func.ln(1 + func.exp(-gap)),
+    )
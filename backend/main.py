@@ -1,13 +1,21 @@
 import logging
+from contextlib import asynccontextmanager
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from functionalities.auth import router as auth_router
-from functionalities.search import router as search_router
-from functionalities.favorites import router as favorites_router
+from functionalities.search import router as search_router, top_places_cache, search_count_buffer, index_columns
+from functionalities.favorites import router as favorites_router, favorites_cache
 from fastapi.exceptions import RequestValidationError
 from exceptions import auth_validation_handler
 from database import init_db
+from config import settings, get_job_queue_config
+from places import places_client, place_index
+from agent.agent import close_agent
+from agent.cache import query_fields_cache
+from agent.fast_parser import fast_query_parser
+from utils.jobs import job_queue
+from utils.auth import verified_token_cache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,7 +23,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Restaurant Finder API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await places_client.open()
+    await job_queue.start()
+    await top_places_cache.start()
+    await search_count_buffer.start()
+    try:
+        yield
+    finally:
+        # Flushes the increments still buffered, then finishes queued writes
+        await search_count_buffer.stop()
+        await job_queue.drain(get_job_queue_config()["drain_timeout"])
+        await top_places_cache.stop()
+        await places_client.close()
+        await close_agent()
+
+
+app = FastAPI(title="Restaurant Finder API", version="1.0.0", lifespan=lifespan)
 
 logger.info("Starting Restaurant Finder API")
 
@@ -45,5 +71,22 @@ async def root():
     logger.info("Root endpoint accessed")
     return {"message": "Restaurant Finder API is running!"}
 
+@app.get("/metrics")
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    return {
+        "place_details_cache": places_client.details_cache.stats() if places_client.details_cache else None,
+        "query_fields_cache": query_fields_cache.stats(),
+        "fast_query_parser": fast_query_parser.stats(),
+        "place_index": place_index.stats(),
+        "place_index_columns": index_columns.stats() if index_columns else None,
+        "search_count_buffer": search_count_buffer.stats(),
+        "job_queue": job_queue.stats(),
+        "favorites_cache": favorites_cache.stats(),
+        "auth_token_cache": verified_token_cache.stats(),
+    }
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
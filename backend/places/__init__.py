@@ -0,0 +1,35 @@
+from .client import (
+    PlacesClient,
+    PlacesAPIError,
+    places_client,
+    get_places_client,
+    SEARCH_FIELD_MASK,
+    SEARCH_PAGED_FIELD_MASK,
+    DETAILS_FIELD_MASK,
+)
+from .field_mask import RESPONSE_FIELDS, search_field_mask
+from .cache import PlaceCacheBackend, InMemoryPlaceCacheBackend, PlaceDetailsCache
+from .index import Candidates, Location, PlaceIndex, place_index, get_place_index
+from .catalog import PlaceCatalog, create_place_catalog
+
+__all__ = [
+    "PlacesClient",
+    "PlacesAPIError",
+    "places_client",
+    "get_places_client",
+    "SEARCH_FIELD_MASK",
+    "SEARCH_PAGED_FIELD_MASK",
+    "DETAILS_FIELD_MASK",
+    "RESPONSE_FIELDS",
+    "search_field_mask",
+    "PlaceCacheBackend",
+    "InMemoryPlaceCacheBackend",
+    "PlaceDetailsCache",
+    "Candidates",
+    "Location",
+    "PlaceIndex",
+    "place_index",
+    "get_place_index",
+    "PlaceCatalog",
+    "create_place_catalog",
+]
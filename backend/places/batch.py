@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def fetch_many(
+    keys: Sequence[str],
+    fetch: Callable[[str], Awaitable[Optional[T]]],
+    concurrency: int,
+    item_timeout: float,
+) -> List[Optional[T]]:
+    """
+    Run fetch for every key with bounded concurrency.
+
+    At most `concurrency` fetches are in flight at once, and each one gets
+    `item_timeout` seconds once it has acquired a slot. A fetch that fails
+    or times out yields None instead of failing the whole batch.
+
+    Args:
+        keys: Keys to fetch (e.g. place IDs)
+        fetch: Coroutine function fetching a single key
+        concurrency: Max number of in-flight fetches
+        item_timeout: Per-fetch timeout in seconds
+
+    Returns:
+        Results in the same order as keys, None for failed items
+    """
+    if not keys:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(key: str) -> Optional[T]:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(fetch(key), timeout=item_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Timed out fetching {key} after {item_timeout}s")
+            except Exception as e:
+                logger.warning(f"Failed to fetch {key}: {e}")
+            return None
+
+    return list(await asyncio.gather(*(run(key) for key in keys)))
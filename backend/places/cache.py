@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+from config import get_place_cache_config
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class PlaceCacheBackend(ABC):
+    """
+    Storage for cached place payloads.
+
+    Async so that a shared backend (e.g. Redis) can be plugged in
+    without changing PlaceDetailsCache or its callers.
+    """
+
+    @abstractmethod
+    async def get(self, place_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def set(self, place_id: str, place_data: dict, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, place_id: str) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class InMemoryPlaceCacheBackend(PlaceCacheBackend):
+    """Per-process backend: size-bounded LRU with per-entry TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+
+    async def get(self, place_id: str) -> Optional[dict]:
+        return self._cache.get(place_id)
+
+    async def set(self, place_id: str, place_data: dict, ttl: float) -> None:
+        self._cache.set(place_id, place_data, ttl)
+
+    async def delete(self, place_id: str) -> None:
+        self._cache.delete(place_id)
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        return {
+            "size": stats["size"],
+            "max_size": stats["max_size"],
+            "evictions": stats["evictions"],
+            "expirations": stats["expirations"],
+        }
+
+
+class _FetchAbandoned(Exception):
+    """Set on a shared fetch whose owner was cancelled before it finished."""
+
+
+class PlaceDetailsCache:
+    """
+    Place-details cache keyed by place_id.
+
+    Concurrent misses for the same place_id share a single fetch
+    (single-flight), so a burst of requests for a popular place
+    results in one Places round trip.
+    """
+
+    def __init__(self, backend: PlaceCacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_fetch(
+        self,
+        place_id: str,
+        fetch: Callable[[str], Awaitable[Optional[dict]]],
+    ) -> Optional[dict]:
+        """
+        Get a place from the cache, fetching and storing it on a miss.
+        Failed fetches (None or exception) are not cached.
+
+        If the request that owns a shared fetch is cancelled, its waiters
+        are not: the first of them takes the fetch over.
+        """
+        while True:
+            place_data = await self.backend.get(place_id)
+            if place_data is not None:
+                self.hits += 1
+                return place_data
+
+            inflight = self._inflight.get(place_id)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _FetchAbandoned:
+                continue
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[place_id] = future
+        try:
+            place_data = await fetch(place_id)
+            if place_data is not None:
+                await self.backend.set(place_id, place_data, self.ttl)
+            future.set_result(place_data)
+            return place_data
+        except asyncio.CancelledError:
+            # Only this caller gave up; let the waiters retry
+            future.set_exception(_FetchAbandoned())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(place_id, None)
+
+    async def prime(self, places: Iterable[dict]) -> None:
+        """Store place payloads we already have (e.g. from a text search)."""
+        for place_data in places:
+            place_id = place_data.get("id") if isinstance(place_data, dict) else None
+            if place_id:
+                await self.backend.set(place_id, place_data, self.ttl)
+
+    async def invalidate(self, place_id: str) -> None:
+        await self.backend.delete(place_id)
+
+    def stats(self) -> dict:
+        """Get cache counters for monitoring."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "inflight": len(self._inflight),
+            **self.backend.stats(),
+        }
+
+
+def create_place_cache_backend(config: dict) -> PlaceCacheBackend:
+    """Create the place cache backend named by PLACE_CACHE_BACKEND."""
+    backend = config["backend"]
+    if backend == "memory":
+        return InMemoryPlaceCacheBackend(max_size=config["max_size"], ttl=config["ttl"])
+    raise ValueError(f"Unknown place cache backend: {backend}")
+
+
+def create_place_details_cache() -> Optional[PlaceDetailsCache]:
+    """Create the place-details cache from settings, or None if disabled."""
+    config = get_place_cache_config()
+    if not config["enabled"]:
+        return None
+    return PlaceDetailsCache(create_place_cache_backend(config), ttl=config["ttl"])
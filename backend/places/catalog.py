@@ -0,0 +1,268 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_place_catalog_config
+from database.config import get_async_db_context_manager
+from database.models.place import PlaceModel
+from utils.jobs import get_job_queue
+from .client import PlacesClient
+from .hours import with_open_now
+
+logger = logging.getLogger(__name__)
+
+# Typed column -> top-level payload key it is copied from
+_FLAG_COLUMNS = {
+    "allows_dogs": "allowsDogs",
+    "delivery": "delivery",
+    "dine_in": "dineIn",
+    "reservable": "reservable",
+    "outdoor_seating": "outdoorSeating",
+    "serves_breakfast": "servesBreakfast",
+    "serves_lunch": "servesLunch",
+    "serves_dinner": "servesDinner",
+    "serves_coffee": "servesCoffee",
+    "serves_vegetarian_food": "servesVegetarianFood",
+}
+
+_TYPED_COLUMNS = (
+    "name", "rating", "price_level", "price_start", "price_end",
+    "primary_type", "business_status", *_FLAG_COLUMNS,
+)
+
+# A row from a join against the places table: (place_id, payload, fetched_at)
+CatalogRow = Tuple[str, Optional[dict], Optional[datetime]]
+
+
+def _price_units(price: Optional[dict]) -> Optional[float]:
+    try:
+        return float(price["units"]) if price else None
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+def place_row(place: dict) -> dict:
+    """Build a places table row (payload plus typed columns) from a Places payload."""
+    price_range = place.get("priceRange") or {}
+    row = {
+        "place_id": place["id"],
+        "payload": place,
+        "name": (place.get("displayName") or {}).get("text"),
+        "rating": place.get("rating"),
+        "price_level": place.get("priceLevel"),
+        "price_start": _price_units(price_range.get("startPrice")),
+        "price_end": _price_units(price_range.get("endPrice")),
+        "primary_type": place.get("primaryType"),
+        "business_status": place.get("businessStatus"),
+    }
+    for column, key in _FLAG_COLUMNS.items():
+        row[column] = place.get(key)
+    return row
+
+
+def _upsert_statement(rows: List[dict]):
+    stmt = insert(PlaceModel).values(rows)
+    excluded = stmt.excluded
+    set_ = {
+        column: func.coalesce(getattr(excluded, column), getattr(PlaceModel, column))
+        for column in _TYPED_COLUMNS
+    }
+    set_["payload"] = PlaceModel.payload.op("||")(excluded.payload)
+    set_["fetched_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=["place_id"], set_=set_)
+
+
+class PlaceCatalog:
+    """
+    Local copy of Places payloads in the `places` table.
+
+    Every Places response is upserted, and id lookups are served from the
+    table while a row is younger than the freshness window, so favorites
+    and top places become a DB join instead of one HTTP call per place.
+
+    openNow goes stale long before the rest of a payload, so it is
+    recomputed from the opening periods whenever a payload is served.
+    Rows whose periods cannot answer it are only served for
+    open_now_freshness seconds.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        places_client: PlacesClient,
+        freshness: float,
+        open_now_freshness: float,
+        enabled: bool = True,
+    ):
+        self.db: AsyncSession = session
+        self.places_client: PlacesClient = places_client
+        self.freshness = timedelta(seconds=freshness)
+        self.open_now_freshness = timedelta(seconds=open_now_freshness)
+        self.enabled = enabled
+
+    def is_fresh(self, fetched_at: Optional[datetime], freshness: Optional[timedelta] = None) -> bool:
+        return fetched_at is not None and datetime.now(timezone.utc) - fetched_at < (freshness or self.freshness)
+
+    def _servable(self, payload: dict, fetched_at: Optional[datetime]) -> Optional[dict]:
+        """A stored payload with a current openNow, or None if it has to be refetched."""
+        if not self.is_fresh(fetched_at):
+            return None
+        if "currentOpeningHours" not in payload:
+            return payload
+        current = with_open_now(payload)
+        if current is not None:
+            return current
+        return payload if self.is_fresh(fetched_at, self.open_now_freshness) else None
+
+    def _rows(self, places: Iterable[dict]) -> List[dict]:
+        # Last payload wins for duplicate ids within one statement; sorted so
+        # concurrent upserts (now running on several job workers) lock rows
+        # in the same order and cannot deadlock each other
+        rows = {place["id"]: place_row(place) for place in places if place.get("id")}
+        return [rows[place_id] for place_id in sorted(rows)]
+
+    async def upsert(self, places: Iterable[dict]) -> bool:
+        """
+        Insert or refresh places from a Places response.
+
+        Payloads are merged into the stored one (jsonb ||), so a response
+        fetched with a reduced field mask does not erase other fields.
+        Typed columns keep their stored value when the new payload lacks
+        the field.
+
+        Returns:
+            True on success, False if the catalog is disabled or the write failed
+        """
+        if not self.enabled:
+            return False
+
+        rows = self._rows(places)
+        if not rows:
+            return False
+
+        try:
+            await self.db.execute(_upsert_statement(rows))
+            await self.db.commit()
+            return True
+        except Exception as e:
+            logger.error(f"PlaceCatalog: Failed to upsert {len(rows)} places: {e}")
+            await self.db.rollback()
+            return False
+
+    def upsert_later(self, places: Iterable[dict]) -> bool:
+        """
+        Queue an upsert on the background job queue, so the request does
+        not wait for the write. The job uses its own session and is
+        retried on failure.
+
+        Returns:
+            True if the write was queued
+        """
+        if not self.enabled:
+            return False
+
+        rows = self._rows(places)
+        if not rows:
+            return False
+
+        async def write() -> None:
+            async with get_async_db_context_manager() as session:
+                await session.execute(_upsert_statement(rows))
+                await session.commit()
+
+        return get_job_queue().submit(f"catalog_upsert[{len(rows)}]", write)
+
+    def warm_later(self, place_ids: Sequence[str]) -> bool:
+        """
+        Queue loading places into the table when they are missing or
+        stale, so a later join (e.g. a favorites page) is served locally.
+
+        Returns:
+            True if the job was queued
+        """
+        if not self.enabled or not place_ids:
+            return False
+
+        place_ids = list(place_ids)
+
+        async def warm() -> None:
+            async with get_async_db_context_manager() as session:
+                catalog = PlaceCatalog(
+                    session,
+                    self.places_client,
+                    self.freshness.total_seconds(),
+                    self.open_now_freshness.total_seconds(),
+                )
+                await catalog.get_places(place_ids)
+
+        return get_job_queue().submit(f"catalog_warm[{len(place_ids)}]", warm)
+
+    async def get_places(self, place_ids: Sequence[str]) -> List[Optional[dict]]:
+        """
+        Get place payloads by id, from the table when fresh, else from Google.
+
+        Returns:
+            Payloads in the same order as place_ids, None for places that could not be loaded
+        """
+        if not place_ids:
+            return []
+
+        rows: Dict[str, CatalogRow] = {}
+        if self.enabled:
+            try:
+                stmt = select(PlaceModel.place_id, PlaceModel.payload, PlaceModel.fetched_at).where(
+                    PlaceModel.place_id.in_(place_ids)
+                )
+                result = await self.db.execute(stmt)
+                rows = {row.place_id: tuple(row) for row in result}
+            except Exception as e:
+                logger.error(f"PlaceCatalog: Failed to read places: {e}")
+
+        return await self.complete([rows.get(place_id, (place_id, None, None)) for place_id in place_ids])
+
+    async def complete(self, rows: Sequence[CatalogRow]) -> List[Optional[dict]]:
+        """
+        Resolve rows from an outer join against the places table.
+
+        Fresh payloads are used with openNow recomputed; missing or stale
+        ones are fetched from Google concurrently and written back to the
+        table in the background.
+
+        Returns:
+            Payloads in row order, None for places that could not be loaded
+        """
+        payloads: List[Optional[dict]] = []
+        missing: List[int] = []
+        for index, (place_id, payload, fetched_at) in enumerate(rows):
+            served = self._servable(payload, fetched_at) if payload is not None else None
+            payloads.append(served)
+            if served is None:
+                missing.append(index)
+
+        if not missing:
+            return payloads
+
+        fetched = await self.places_client.get_places([rows[index][0] for index in missing])
+        for index, place in zip(missing, fetched):
+            # A failed refresh falls back to the stale copy rather than dropping the place
+            payload = place if place is not None else rows[index][1]
+            if payload is not None:
+                # Fetched payloads may come from the place details cache
+                payload = with_open_now(payload) or payload
+            payloads[index] = payload
+
+        self.upsert_later(place for place in fetched if place is not None)
+        return payloads
+
+
+def create_place_catalog(session: AsyncSession, places_client: PlacesClient) -> PlaceCatalog:
+    config = get_place_catalog_config()
+    return PlaceCatalog(
+        session,
+        places_client,
+        freshness=config["freshness"],
+        open_now_freshness=config["open_now_freshness"],
+        enabled=config["enabled"],
+    )
@@ -0,0 +1,187 @@
+import logging
+from functools import lru_cache
+from typing import List, Optional, Sequence
+import httpx
+from config import get_google_api_config, get_places_client_config
+from .batch import fetch_many
+from .cache import PlaceDetailsCache, create_place_details_cache
+
+logger = logging.getLogger(__name__)
+
+PLACES_BASE_URL = "https://places.googleapis.com/v1"
+
+SEARCH_FIELD_MASK = "places.id,places.internationalPhoneNumber,places.formattedAddress,places.rating,places.googleMapsUri,places.businessStatus,places.priceLevel,places.displayName,places.currentOpeningHours,places.primaryType,places.priceRange,places.photos,places.allowsDogs,places.outdoorSeating,places.liveMusic,places.menuForChildren,places.servesCocktails,places.servesDessert,places.servesCoffee,places.goodForChildren,places.restroom,places.goodForGroups,places.goodForWatchingSports,places.paymentOptions,places.accessibilityOptions,places.delivery,places.dineIn,places.reservable,places.servesBreakfast,places.servesLunch,places.servesDinner,places.servesBeer,places.servesWine,places.servesBrunch,places.servesVegetarianFood,places.location,places.utcOffsetMinutes"
+
+# Paged searches also need the token for the next page of results
+SEARCH_PAGED_FIELD_MASK = SEARCH_FIELD_MASK + ",nextPageToken"
+
+DETAILS_FIELD_MASK = "id,displayName,rating,formattedAddress,internationalPhoneNumber,googleMapsUri,businessStatus,primaryType,priceRange,currentOpeningHours,photos,allowsDogs,delivery,reservable,servesBreakfast,servesLunch,servesDinner,servesVegetarianFood,utcOffsetMinutes"
+
+_DETAILS_FIELDS = frozenset(DETAILS_FIELD_MASK.split(","))
+
+
+class PlacesAPIError(Exception):
+    """Raised when the Places API answers a request with an error status."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Places API returned {status_code}: {message}")
+        self.status_code = status_code
+
+
+@lru_cache(maxsize=256)
+def _search_mask_covers_details(field_mask: str) -> bool:
+    """Whether search results fetched with field_mask can stand in for a details fetch."""
+    fields = {field[len("places."):] for field in field_mask.split(",") if field.startswith("places.")}
+    return _DETAILS_FIELDS <= fields
+
+
+class PlacesClient:
+    """
+    Shared async client for the Google Places API.
+
+    Wraps a single httpx.AsyncClient that lives for the whole application,
+    so keep-alive connections (and HTTP/2 multiplexing when available) are
+    reused across requests instead of paying TCP+TLS setup on every call.
+    """
+
+    def __init__(self, details_cache: Optional[PlaceDetailsCache] = None):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.details_cache = details_cache
+
+    async def open(self) -> None:
+        """Create the underlying connection pool. Safe to call more than once."""
+        if self._client is not None:
+            return
+
+        config = get_places_client_config()
+
+        http2 = config["http2"]
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("PlacesClient: h2 is not installed, falling back to HTTP/1.1")
+                http2 = False
+
+        self._client = httpx.AsyncClient(
+            base_url=PLACES_BASE_URL,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=config["keepalive_expiry"],
+            ),
+            timeout=httpx.Timeout(
+                connect=config["connect_timeout"],
+                read=config["read_timeout"],
+                write=config["write_timeout"],
+                pool=config["pool_timeout"],
+            ),
+            headers={
+                "Content-Type": "application/json",
+                "X-Goog-Api-Key": get_google_api_config()["api_key"] or "",
+            },
+        )
+        logger.info(f"PlacesClient: Opened connection pool (http2={http2})")
+
+    async def close(self) -> None:
+        """Close the underlying connection pool."""
+        if self._client is None:
+            return
+
+        await self._client.aclose()
+        self._client = None
+        logger.info("PlacesClient: Closed connection pool")
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            await self.open()
+        return self._client
+
+    async def search_text(self, payload: dict, field_mask: str = SEARCH_FIELD_MASK) -> dict:
+        """
+        Run a places:searchText request.
+
+        Args:
+            payload: Request body, at least {"textQuery": ...}
+            field_mask: X-Goog-FieldMask header value
+
+        Returns:
+            Decoded JSON response body
+
+        Raises:
+            PlacesAPIError: If Google did not return a 2xx status (e.g. an
+                invalid or expired pageToken)
+        """
+        client = await self._get_client()
+        response = await client.post(
+            "/places:searchText",
+            headers={"X-Goog-FieldMask": field_mask},
+            json=payload,
+        )
+        if response.is_error:
+            message = response.text[:500]
+            logger.warning(f"PlacesClient: searchText failed with {response.status_code}: {message}")
+            raise PlacesAPIError(response.status_code, message)
+        data = response.json()
+
+        if self.details_cache is not None and _search_mask_covers_details(field_mask):
+            await self.details_cache.prime(data.get("places", []))
+
+        return data
+
+    async def get_place(self, place_id: str, field_mask: str = DETAILS_FIELD_MASK) -> Optional[dict]:
+        """
+        Fetch a single place by its ID.
+
+        Returns:
+            Decoded place payload, or None if Google did not return 200
+        """
+        client = await self._get_client()
+        response = await client.get(
+            f"/places/{place_id}",
+            headers={"X-Goog-FieldMask": field_mask},
+        )
+        if response.status_code == 200:
+            return response.json()
+
+        logger.warning(f"Failed to fetch place {place_id}: {response.status_code}")
+        return None
+
+    async def get_place_details(self, place_id: str) -> Optional[dict]:
+        """
+        Fetch a place with DETAILS_FIELD_MASK, going through the
+        place-details cache when it is enabled.
+        """
+        if self.details_cache is None:
+            return await self.get_place(place_id)
+        return await self.details_cache.get_or_fetch(place_id, self.get_place)
+
+    async def get_places(self, place_ids: Sequence[str]) -> List[Optional[dict]]:
+        """
+        Fetch details for many places concurrently.
+
+        Requests are bounded by PLACES_BATCH_CONCURRENCY and each one by
+        PLACES_BATCH_ITEM_TIMEOUT, so total latency is close to the slowest
+        single call rather than the sum of all calls.
+
+        Returns:
+            Place payloads in the same order as place_ids, None for places
+            that failed or timed out
+        """
+        config = get_places_client_config()
+
+        return await fetch_many(
+            place_ids,
+            self.get_place_details,
+            concurrency=config["batch_concurrency"],
+            item_timeout=config["batch_item_timeout"],
+        )
+
+
+places_client = PlacesClient(details_cache=create_place_details_cache())
+
+
+def get_places_client() -> PlacesClient:
+    """Get the application-wide Places client."""
+    return places_client
@@ -0,0 +1,38 @@
+from functools import lru_cache
+from typing import FrozenSet, Optional
+from .client import DETAILS_FIELD_MASK, SEARCH_FIELD_MASK
+
+# Place fields a text search may request: everything the full mask covers
+_SEARCH_FIELDS = frozenset(field[len("places."):] for field in SEARCH_FIELD_MASK.split(","))
+
+# Fields CafeResponse is built from. Same set as the details mask, so
+# reduced search masks still prime the place details cache.
+RESPONSE_FIELDS = tuple(DETAILS_FIELD_MASK.split(","))
+
+# Always requested on searches so results can be placed in the local index grid
+_INDEX_FIELDS = ("location",)
+
+
+@lru_cache(maxsize=256)
+def _build_search_field_mask(filter_keys: FrozenSet[str], paged: bool) -> str:
+    extra = sorted(filter_keys.difference(RESPONSE_FIELDS, _INDEX_FIELDS))
+    mask = ",".join(f"places.{field}" for field in (*RESPONSE_FIELDS, *_INDEX_FIELDS, *extra))
+    return mask + ",nextPageToken" if paged else mask
+
+
+def search_field_mask(fields: Optional[dict], paged: bool = False) -> str:
+    """
+    Build the X-Goog-FieldMask for a text search filtered locally by fields.
+
+    Only the fields CafeResponse needs plus the ones the local filters
+    read are requested. Masks are cached per filter shape (the set of
+    keys), so repeated searches reuse the same string.
+
+    Args:
+        fields: Criteria still applied locally after push-down
+        paged: Also request nextPageToken
+    """
+    # Keys that are not Place fields would make the API reject the mask;
+    # their filters cannot match anything either way
+    filter_keys = frozenset(key for key in (fields or {}) if key in _SEARCH_FIELDS)
+    return _build_search_field_mask(filter_keys, paged)
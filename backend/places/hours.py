@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+_MINUTES_PER_DAY = 24 * 60
+_MINUTES_PER_WEEK = 7 * _MINUTES_PER_DAY
+
+
+def _minute_of_week(point: dict) -> Optional[int]:
+    """Minutes since Sunday 00:00 for a period point ({"day": 0-6 from Sunday, "hour", "minute"})."""
+    try:
+        return int(point["day"]) * _MINUTES_PER_DAY + int(point.get("hour", 0)) * 60 + int(point.get("minute", 0))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def compute_open_now(place: dict, now: Optional[datetime] = None) -> Optional[bool]:
+    """
+    Work out whether a place is open from its opening periods.
+
+    Stored payloads keep the openNow Google reported when they were
+    fetched; the periods and the place's UTC offset stay valid for days,
+    so the flag can be recomputed when the payload is served.
+
+    Args:
+        place: Places payload with currentOpeningHours.periods and utcOffsetMinutes
+        now: Current time (timezone-aware), defaults to now
+
+    Returns:
+        Whether the place is open now, or None if the payload lacks the data
+    """
+    hours = place.get("currentOpeningHours")
+    offset = place.get("utcOffsetMinutes")
+    if not isinstance(hours, dict) or not isinstance(offset, int):
+        return None
+    periods = hours.get("periods")
+    if not isinstance(periods, list):
+        return None
+
+    local = (now or datetime.now(timezone.utc)).astimezone(timezone.utc) + timedelta(minutes=offset)
+    # datetime.weekday() counts from Monday, Places days from Sunday
+    current = ((local.weekday() + 1) % 7) * _MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+    for period in periods:
+        if not isinstance(period, dict) or not isinstance(period.get("open"), dict):
+            return None
+        start = _minute_of_week(period["open"])
+        if start is None:
+            return None
+        if period.get("close") is None:
+            # A single period without a close time means open around the clock
+            return True
+        end = _minute_of_week(period["close"])
+        if end is None:
+            return None
+        if end <= start:
+            end += _MINUTES_PER_WEEK
+        if start <= current < end or start <= current + _MINUTES_PER_WEEK < end:
+            return True
+    return False
+
+
+def with_open_now(place: dict, now: Optional[datetime] = None) -> Optional[dict]:
+    """
+    Return place with currentOpeningHours.openNow recomputed for now.
+
+    The payload may be shared (e.g. with the place details cache), so a
+    copy is returned when the flag changes.
+
+    Returns:
+        The updated payload, or None if openNow cannot be recomputed
+    """
+    open_now = compute_open_now(place, now)
+    if open_now is None:
+        return None
+    hours = place["currentOpeningHours"]
+    if hours.get("openNow") == open_now:
+        return place
+    return {**place, "currentOpeningHours": {**hours, "openNow": open_now}}
@@ -0,0 +1,346 @@
+import math
+import re
+import time
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Protocol, Set, Tuple
+from config import get_place_index_config
+from agent.cache import normalize_query
+
+_TOKEN = re.compile(r"\w+")
+
+# Query words naming a kind of place -> category
+_QUERY_CATEGORIES = {
+    **dict.fromkeys(("cafe", "cafes", "café", "cafés", "kafe", "kafeler", "cafeler", "kahveci", "kahveciler", "coffeeshop"), "cafe"),
+    **dict.fromkeys(("restaurant", "restaurants", "restoran", "restoranlar", "lokanta", "bistro", "eatery"), "restaurant"),
+    **dict.fromkeys(("bar", "bars", "barlar", "pub", "pubs"), "bar"),
+}
+
+Cell = Tuple[int, int]
+
+_EARTH_RADIUS_M = 6371000.0
+
+# Fields whose value goes stale within minutes (openNow flips at opening
+# and closing time), far sooner than ttl; queries filtering on them always
+# go to the Places API
+_VOLATILE_FIELDS = frozenset({"currentOpeningHours"})
+
+
+def _trigrams(token: str) -> FrozenSet[str]:
+    padded = f"${token}$"
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _place_category(primary_type: Optional[str]) -> Optional[str]:
+    if not primary_type:
+        return None
+    if "cafe" in primary_type or "coffee" in primary_type:
+        return "cafe"
+    if "restaurant" in primary_type:
+        return "restaurant"
+    if "bar" in primary_type or "pub" in primary_type:
+        return "bar"
+    return None
+
+
+def query_category(query: str) -> Optional[str]:
+    """Category a query asks for ("cafe", "restaurant", "bar"), if it names exactly one."""
+    categories = {_QUERY_CATEGORIES[token] for token in _TOKEN.findall(normalize_query(query)) if token in _QUERY_CATEGORIES}
+    return categories.pop() if len(categories) == 1 else None
+
+
+@lru_cache(maxsize=256)
+def mask_fields(field_mask: str) -> FrozenSet[str]:
+    """Top-level place fields requested by a searchText field mask."""
+    return frozenset(field[len("places."):].split(".", 1)[0] for field in field_mask.split(",") if field.startswith("places."))
+
+
+def _distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+class _Entry:
+    __slots__ = ("place", "fields", "trigrams", "cell", "category", "added_at", "slot")
+
+    def __init__(self, place: dict, fields: FrozenSet[str], trigrams: FrozenSet[str], cell: Optional[Cell], category: Optional[str], added_at: float, slot: int):
+        self.place = place
+        self.fields = fields
+        self.trigrams = trigrams
+        self.cell = cell
+        self.category = category
+        self.added_at = added_at
+        self.slot = slot
+
+
+class Location(NamedTuple):
+    latitude: float
+    longitude: float
+    radius_m: float
+
+
+class Candidates(NamedTuple):
+    """Ranked candidate payloads and the index slot of each."""
+    places: List[dict]
+    slots: List[int]
+
+
+class SlotStore(Protocol):
+    """Per-slot storage kept in step with the index (e.g. filter columns)."""
+
+    def set(self, slot: int, place: dict) -> None:
+        ...
+
+    def clear(self, slot: int) -> None:
+        ...
+
+
+class PlaceIndex:
+    """
+    In-process index over every place payload seen in text search responses.
+
+    Name and address tokens go into a trigram inverted index, and
+    lat/lng into a fixed grid, so candidate places for a query can be
+    found without calling places:searchText. Each entry remembers which
+    fields its payloads were fetched with, so a place is only offered to
+    filters it actually has data for. Entries expire after ttl seconds
+    and the least recently added are evicted beyond max_places.
+
+    Every entry holds one of max_places slots; attached SlotStores are
+    told when a slot is filled or freed.
+    """
+
+    def __init__(self, max_places: int, ttl: float, cell_size: float, min_similarity: float, enabled: bool = True):
+        self.max_places = max_places
+        self.ttl = ttl
+        self.cell_size = cell_size
+        self.min_similarity = min_similarity
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._cells: Dict[Cell, Set[str]] = defaultdict(set)
+        self._free_slots: List[int] = []
+        self._next_slot = 0
+        self._stores: List[SlotStore] = []
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def attach(self, store: SlotStore) -> None:
+        """Keep store in step with the index, starting with the places already indexed."""
+        self._stores.append(store)
+        for entry in self._entries.values():
+            store.set(entry.slot, entry.place)
+
+    def _allocate_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        self._next_slot += 1
+        return self._next_slot - 1
+
+    def _cell(self, latitude: float, longitude: float) -> Cell:
+        return math.floor(latitude / self.cell_size), math.floor(longitude / self.cell_size)
+
+    def _remove(self, place_id: str) -> None:
+        entry = self._entries.pop(place_id, None)
+        if entry is None:
+            return
+        self._free_slots.append(entry.slot)
+        for store in self._stores:
+            store.clear(entry.slot)
+        for trigram in entry.trigrams:
+            postings = self._postings.get(trigram)
+            if postings is not None:
+                postings.discard(place_id)
+                if not postings:
+                    del self._postings[trigram]
+        if entry.cell is not None:
+            cell = self._cells.get(entry.cell)
+            if cell is not None:
+                cell.discard(place_id)
+                if not cell:
+                    del self._cells[entry.cell]
+
+    def add(self, places: Iterable[dict], field_mask: str) -> None:
+        """Index places from a searchText response fetched with field_mask."""
+        if not self.enabled:
+            return
+
+        mask_keys = mask_fields(field_mask)
+        now = time.monotonic()
+        for place in places:
+            place_id = place.get("id")
+            if not place_id:
+                continue
+
+            fields = mask_keys
+            previous = self._entries.get(place_id)
+            if previous is not None and now - previous.added_at < self.ttl:
+                # Merge with the still-valid copy; a reduced mask must not hide known fields
+                place = {**previous.place, **place}
+                fields = fields | previous.fields
+            self._remove(place_id)
+
+            name = (place.get("displayName") or {}).get("text") or ""
+            address = place.get("formattedAddress") or ""
+            tokens = _TOKEN.findall(normalize_query(f"{name} {address}"))
+            trigrams = frozenset().union(*(_trigrams(token) for token in tokens)) if tokens else frozenset()
+
+            location = place.get("location") or {}
+            latitude, longitude = location.get("latitude"), location.get("longitude")
+            cell = self._cell(latitude, longitude) if latitude is not None and longitude is not None else None
+
+            # Evict before inserting, so there are never more than max_places slots
+            while self._entries and len(self._entries) >= self.max_places:
+                self._remove(next(iter(self._entries)))
+
+            entry = _Entry(place, fields, trigrams, cell, _place_category(place.get("primaryType")), now, self._allocate_slot())
+            self._entries[place_id] = entry
+            for trigram in trigrams:
+                self._postings[trigram].add(place_id)
+            if cell is not None:
+                self._cells[cell].add(place_id)
+            for store in self._stores:
+                store.set(entry.slot, place)
+
+    def _text_scores(self, terms: List[str]) -> Optional[Dict[str, float]]:
+        """
+        Places matching every term, with their mean term similarity.
+        A term matches when enough of its trigrams occur in the place's
+        name or address, which tolerates Turkish suffixes ("kadıköyde").
+        """
+        scores: Optional[Dict[str, float]] = None
+        for term in terms:
+            term_trigrams = _trigrams(term)
+            counts: Dict[str, int] = defaultdict(int)
+            for trigram in term_trigrams:
+                for place_id in self._postings.get(trigram, ()):
+                    counts[place_id] += 1
+
+            matches = {}
+            for place_id, count in counts.items():
+                similarity = count / len(term_trigrams)
+                if similarity >= self.min_similarity and (scores is None or place_id in scores):
+                    matches[place_id] = similarity + (scores[place_id] if scores is not None else 0.0)
+            scores = matches
+            if not scores:
+                return {}
+
+        if scores is None:
+            return None
+        return {place_id: score / len(terms) for place_id, score in scores.items()}
+
+    def _nearby(self, location: Location) -> Dict[str, float]:
+        """Places within location.radius_m, with their distance in meters."""
+        lat_cells = math.ceil(location.radius_m / 111320.0 / self.cell_size)
+        lng_scale = max(math.cos(math.radians(location.latitude)), 0.01)
+        lng_cells = math.ceil(location.radius_m / (111320.0 * lng_scale) / self.cell_size)
+        center_lat, center_lng = self._cell(location.latitude, location.longitude)
+
+        distances = {}
+        for lat_cell in range(center_lat - lat_cells, center_lat + lat_cells + 1):
+            for lng_cell in range(center_lng - lng_cells, center_lng + lng_cells + 1):
+                for place_id in self._cells.get((lat_cell, lng_cell), ()):
+                    place_location = self._entries[place_id].place["location"]
+                    distance = _distance_m(
+                        location.latitude, location.longitude,
+                        place_location["latitude"], place_location["longitude"],
+                    )
+                    if distance <= location.radius_m:
+                        distances[place_id] = distance
+        return distances
+
+    def candidates(
+        self,
+        terms: List[str],
+        category: Optional[str],
+        required_fields: FrozenSet[str],
+        location: Optional[Location] = None,
+    ) -> Optional[Candidates]:
+        """
+        Ranked candidate payloads for a query, or None when the index
+        cannot answer it (no place or area terms and no location, or a
+        filter on a volatile field such as openNow).
+
+        Args:
+            terms: Place/area words of the query (see agent.fast_parser.extract_terms)
+            category: Only places of this category, if given
+            required_fields: Fields the caller's filters read; places fetched
+                without any of them are left out
+            location: Only places within this radius
+        """
+        if not self.enabled or (not terms and location is None):
+            return None
+        if required_fields & _VOLATILE_FIELDS:
+            return None
+
+        text_scores = self._text_scores(terms) if terms else None
+        distances = self._nearby(location) if location is not None else None
+
+        if text_scores is None:
+            place_ids = set(distances)
+        elif distances is None:
+            place_ids = set(text_scores)
+        else:
+            place_ids = set(text_scores).intersection(distances)
+
+        now = time.monotonic()
+        ranked = []
+        for place_id in place_ids:
+            entry = self._entries[place_id]
+            if now - entry.added_at >= self.ttl:
+                continue
+            if category is not None and entry.category != category:
+                continue
+            if not required_fields <= entry.fields:
+                continue
+
+            score = text_scores[place_id] if text_scores is not None else 1.0
+            if distances is not None:
+                score *= 1.0 - 0.5 * distances[place_id] / location.radius_m
+            ranked.append((score, entry.place.get("rating") or 0.0, entry))
+
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return Candidates([entry.place for _, _, entry in ranked], [entry.slot for _, _, entry in ranked])
+
+    def record(self, served: bool) -> None:
+        if served:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_places,
+            "trigrams": len(self._postings),
+            "cells": len(self._cells),
+            "local_hits": self.hits,
+            "google_fallbacks": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def _create_place_index() -> PlaceIndex:
+    config = get_place_index_config()
+    return PlaceIndex(
+        max_places=config["max_places"],
+        ttl=config["ttl"],
+        cell_size=config["cell_size"],
+        min_similarity=config["min_similarity"],
+        enabled=config["enabled"],
+    )
+
+
+place_index = _create_place_index()
+
+
+def get_place_index() -> PlaceIndex:
+    """Get the application-wide local place index."""
+    return place_index
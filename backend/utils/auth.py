@@ -0,0 +1,141 @@
+import hashlib
+import logging
+import time
+from typing import Optional, Tuple
+import jwt
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from config import settings, get_auth_token_cache_config
+from utils.cache import TTLCache
+
+# Access token verification and the FastAPI auth dependencies. Kept apart
+# from utils.jwt (token creation, which needs the auth feature's models),
+# so any feature can depend on auth without importing functionalities.auth.
+
+logger = logging.getLogger(__name__)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _verify_access_token(token: str) -> Tuple[int, Optional[float]]:
+    """
+    Verify an access token once.
+
+    Returns:
+        The user id and the token's exp as a Unix timestamp (None if it has none)
+
+    Raises:
+        HTTPException: 401 if the token is expired, malformed, not an access token or has no user id
+    """
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise _unauthorized("Token süresi dolmuş")
+    except jwt.InvalidTokenError:
+        raise _unauthorized("Geçersiz token")
+
+    if payload.get("type", "access") != "access":
+        raise _unauthorized("Geçersiz token türü")
+
+    user_id = payload.get("user_id")
+    if not isinstance(user_id, int) or isinstance(user_id, bool) or user_id <= 0:
+        raise _unauthorized("Geçersiz token")
+    return user_id, payload.get("exp")
+
+
+class VerifiedTokenCache:
+    """
+    Verified access tokens, each kept until its own exp (bounded LRU).
+
+    Entries are keyed by the SHA-256 of the whole token, so a hit returns
+    the user id without decoding the token or checking its signature
+    again, while a token whose payload was edited is still a miss.
+    Tokens are not revocable before exp anyway, so caching them until
+    then does not change what is accepted.
+    """
+
+    def __init__(self, max_size: int, max_ttl: float, enabled: bool = True):
+        self._cache = TTLCache(max_size=max_size, ttl=max_ttl)
+        self.enabled = enabled
+        self.verifications = 0
+        self.verify_seconds = 0.0
+        self.hit_seconds = 0.0
+
+    def get_user_id(self, token: str) -> int:
+        """
+        Get the user id of a valid access token.
+
+        Raises:
+            HTTPException: 401 if the token is not a valid access token
+        """
+        started = time.perf_counter()
+        key = hashlib.sha256(token.encode()).digest()
+        if self.enabled:
+            user_id = self._cache.get(key)
+            if user_id is not None:
+                self.hit_seconds += time.perf_counter() - started
+                return user_id
+
+        try:
+            user_id, expires_at = _verify_access_token(token)
+        finally:
+            self.verifications += 1
+            self.verify_seconds += time.perf_counter() - started
+
+        ttl = self._cache.ttl if expires_at is None else min(expires_at - time.time(), self._cache.ttl)
+        if self.enabled and ttl > 0:
+            self._cache.set(key, user_id, ttl=ttl)
+        return user_id
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats(),
+            "verifications": self.verifications,
+            "avg_verify_us": round(self.verify_seconds / self.verifications * 1e6, 1) if self.verifications else 0.0,
+            "avg_hit_us": round(self.hit_seconds / self._cache.hits * 1e6, 1) if self._cache.hits else 0.0,
+        }
+
+
+def _create_verified_token_cache() -> VerifiedTokenCache:
+    config = get_auth_token_cache_config()
+    return VerifiedTokenCache(max_size=config["max_size"], max_ttl=config["max_ttl"], enabled=config["enabled"])
+
+
+verified_token_cache = _create_verified_token_cache()
+
+
+def get_user_id_from_token(token: str) -> int:
+    """
+    Extract user ID from a JWT access token, verifying it only on first use.
+
+    Raises:
+        HTTPException: 401 if the token is not a valid access token
+    """
+    return verified_token_cache.get_user_id(token)
+
+
+bearer_scheme = HTTPBearer()
+optional_bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> int:
+    """FastAPI dependency: ID of the user the bearer token belongs to (401 otherwise)."""
+    return get_user_id_from_token(credentials.credentials)
+
+
+async def get_optional_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer_scheme)
+) -> Optional[int]:
+    """FastAPI dependency for public endpoints: the user ID if a valid bearer token was sent, else None."""
+    if credentials is None:
+        return None
+    try:
+        return get_user_id_from_token(credentials.credentials)
+    except HTTPException:
+        return None
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, NamedTuple
+from config import get_job_queue_config
+
+logger = logging.getLogger(__name__)
+
+JobFn = Callable[[], Awaitable[object]]
+
+
+class _Job(NamedTuple):
+    name: str
+    fn: JobFn
+    submitted_at: float
+
+
+class JobQueue:
+    """
+    Bounded in-process queue for fire-and-forget async work (analytics
+    writes, cache write-backs) that must not delay responses.
+
+    submit() never waits: when the queue is full the job is rejected and
+    counted, so a slow database shows up as backpressure in stats()
+    instead of as request latency. Failed jobs are retried with
+    exponential backoff. drain() stops intake and finishes queued jobs
+    on shutdown.
+    """
+
+    def __init__(self, capacity: int, workers: int, max_retries: int, retry_backoff: float):
+        self.capacity = capacity
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue: "asyncio.Queue[_Job]" = asyncio.Queue(maxsize=capacity)
+        self._tasks: List[asyncio.Task] = []
+        self._accepting = True
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.max_wait = 0.0
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._accepting = True
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"JobQueue: Started {self.workers} workers")
+
+    def submit(self, name: str, fn: JobFn) -> bool:
+        """
+        Queue fn to run in the background.
+
+        Args:
+            name: Job name for logs
+            fn: Coroutine function taking no arguments
+
+        Returns:
+            False if the job was rejected (queue full or shutting down)
+        """
+        if not self._accepting:
+            self.rejected += 1
+            logger.warning(f"JobQueue: Rejected {name}, queue is draining")
+            return False
+        try:
+            self._queue.put_nowait(_Job(name, fn, time.monotonic()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            logger.warning(f"JobQueue: Rejected {name}, queue is full ({self.capacity})")
+            return False
+
+        self.submitted += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    async def _run(self, job: _Job) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await job.fn()
+                self.completed += 1
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    logger.error(f"JobQueue: {job.name} failed after {attempt + 1} attempts: {e}")
+                    return
+                self.retried += 1
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"JobQueue: {job.name} failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self.max_wait = max(self.max_wait, time.monotonic() - job.submitted_at)
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def drain(self, timeout: float) -> None:
+        """Stop accepting jobs, wait up to timeout for queued ones, then stop the workers."""
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"JobQueue: Drain timed out, dropping {self._queue.qsize()} queued jobs")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("JobQueue: Drained")
+
+    def stats(self) -> dict:
+        return {
+            "depth": self._queue.qsize(),
+            "capacity": self.capacity,
+            "max_depth": self.max_depth,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "rejected": self.rejected,
+        }
+
+
+def _create_job_queue() -> JobQueue:
+    config = get_job_queue_config()
+    return JobQueue(
+        capacity=config["capacity"],
+        workers=config["workers"],
+        max_retries=config["max_retries"],
+        retry_backoff=config["retry_backoff"],
+    )
+
+
+job_queue = _create_job_queue()
+
+
+def get_job_queue() -> JobQueue:
+    """Get the application-wide background job queue."""
+    return job_queue
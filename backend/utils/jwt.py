@@ -29,33 +29,6 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str):
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: int = payload.get("user_id")
-        token_type: str = payload.get("type", "access")
-        
-        if token_type != "access":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Geçersiz token türü",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        token_data = TokenData(user_id=user_id)
-        return token_data
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token süresi dolmuş",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Geçersiz token",
-        )
-
 def verify_refresh_token(token: str):
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -83,16 +56,3 @@ def verify_refresh_token(token: str):
             detail="Geçersiz yenileme tokeni",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-def get_user_id_from_token(token: str) -> Optional[int]:
-        """Extract user ID from JWT token."""
-        try:
-            token_data = verify_token(token)
-            return token_data.user_id
-        except Exception as e:
-            logger.error(f"Error extracting user ID from token: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Geçersiz token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
\ No newline at end of file